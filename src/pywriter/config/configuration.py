@@ -4,7 +4,7 @@ Copyright (c) 2022 Peter Triesberger
 For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
-from configparser import ConfigParser
+import os
 
 
 class Configuration:
@@ -57,6 +57,10 @@ class Configuration:
             
         Settings and options that can not be read in, remain unchanged.
         """
+        if not os.path.isfile(iniFile):
+            return
+
+        from configparser import ConfigParser
         config = ConfigParser()
         config.read(iniFile, encoding='utf-8')
         if config.has_section(self._sLabel):
@@ -76,6 +80,7 @@ class Configuration:
         Positional arguments:
             iniFile -- str: path configuration file path.
         """
+        from configparser import ConfigParser
         config = ConfigParser()
         if self.settings:
             config.add_section(self._sLabel)
@@ -25,8 +25,9 @@ class YwCnv:
 
         Operation:
         1. Make the source object read the source file.
-        2. Make the target object merge the source object's instance variables.
-        3. Make the target object write the target file.
+        2. Stop, if the target is up to date with the source.
+        3. Make the target object merge the source object's instance variables.
+        4. Make the target object write the target file.
         Return a message beginning with the ERROR constant in case of error.
 
         Error handling:
@@ -51,6 +52,9 @@ class YwCnv:
         if message.startswith(ERROR):
             return message
 
+        if self._is_up_to_date(source, target):
+            return f'{_("No changes")}: "{os.path.normpath(source.filePath)}".'
+
         message = target.merge(source)
         if message.startswith(ERROR):
             return message
@@ -66,3 +70,13 @@ class YwCnv:
         This is a stub to be overridden by subclass methods.
         """
         return True
+
+    def _is_up_to_date(self, source, target):
+        """Return True if the target file need not be written.
+
+        Positional arguments:
+            source, target -- Novel subclass instances; source has been read.
+        
+        This is a stub to be overridden by subclass methods.
+        """
+        return False
@@ -0,0 +1,27 @@
+"""Helper module for comparing generated text with existing files.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+
+
+def canonical_text(text):
+    """Return the text with line breaks normalized to "\\n".
+
+    This makes the comparison independent of the platform the file was written on.
+    """
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def is_unchanged(filePath, text):
+    """Return True if the file at filePath has the same canonical content as text.
+
+    The texts are compared directly.
+    """
+    try:
+        with open(filePath, 'r', encoding='utf-8') as f:
+            return canonical_text(f.read()) == canonical_text(text)
+
+    except:
+        return False
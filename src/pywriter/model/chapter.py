@@ -20,6 +20,8 @@ class Chapter:
         suppressChapterBreak -- bool: Suppress chapter break when exporting.
         srtScenes -- list of str: the chapter's sorted scene IDs.        
     """
+    __slots__ = ('title', 'desc', 'chLevel', 'chType', 'isUnused', 'suppressChapterTitle', 'isTrash',
+                 'suppressChapterBreak', 'srtScenes', '_kwVar')
 
     def __init__(self):
         """Initialize instance variables."""
@@ -76,6 +78,18 @@ class Chapter:
         # The chapter's scene IDs. The order of its elements
         # corresponds to the chapter's order of the scenes.
 
-        self.kwVar = {}
+        self._kwVar = None
         # dictionary
         # Optional key/value instance variables for customization.
+        # Created on first access, because most instances have none.
+
+    @property
+    def kwVar(self):
+        """Return the dictionary of custom keyword variables, creating it on first access."""
+        if self._kwVar is None:
+            self._kwVar = {}
+        return self._kwVar
+
+    @kwVar.setter
+    def kwVar(self, kwVar):
+        self._kwVar = kwVar
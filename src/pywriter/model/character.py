@@ -20,6 +20,8 @@ class Character(WorldElement):
     MAJOR_MARKER = 'Major'
     MINOR_MARKER = 'Minor'
 
+    __slots__ = ('notes', 'bio', 'goals', 'fullName', 'isMajor')
+
     def __init__(self):
         """Extends the superclass constructor by adding instance variables."""
         super().__init__()
@@ -15,8 +15,8 @@ class Scene:
         desc -- str: scene description in a single string.
         sceneContent -- str: scene content (property with getter and setter).
         rtfFile -- str: RTF file name (yWriter 5).
-        wordCount - int: word count (derived; updated by the sceneContent setter).
-        letterCount - int: letter count (derived; updated by the sceneContent setter).
+        wordCount - int: word count (derived from sceneContent on first access; property with getter and setter).
+        letterCount - int: letter count (derived from sceneContent on first access; property with getter and setter).
         isUnused -- bool: True if the scene is marked "Unused". 
         isNotesScene -- bool: True if the scene type is "Notes".
         isTodoScene -- bool: True if the scene type is "Todo". 
@@ -57,6 +57,17 @@ class Scene:
     NULL_DATE = '0001-01-01'
     NULL_TIME = '00:00:00'
 
+    _MARKUP = re.compile(r'\[.+?\]|/\*.+?\*/')
+    # yWriter raw markup and comments.
+
+    __slots__ = ('title', 'desc', '_sceneContent', 'rtfFile', '_wordCount', '_letterCount',
+                 'isUnused', 'isNotesScene', 'isTodoScene', 'doNotExport', 'status', 'sceneNotes', 'tags',
+                 'field1', 'field2', 'field3', 'field4', 'appendToPrev', 'isReactionScene', 'isSubPlot',
+                 'goal', 'conflict', 'outcome', 'characters', 'locations', 'items',
+                 'date', 'time', 'minute', 'hour', 'day', 'lastsMinutes', 'lastsHours', 'lastsDays',
+                 'image', '_kwVar')
+    # Projects may have many thousands of scenes, so the instances do without a __dict__.
+
     def __init__(self):
         """Initialize instance variables."""
         self.title = None
@@ -77,14 +88,14 @@ class Scene:
         # xml: <RTFFile>
         # Name of the file containing the scene in yWriter 5.
 
-        self.wordCount = 0
+        self._wordCount = 0
         # int # xml: <WordCount>
-        # To be updated by the sceneContent setter
+        # None: to be counted from sceneContent on first access
 
-        self.letterCount = 0
+        self._letterCount = 0
         # int
         # xml: <LetterCount>
-        # To be updated by the sceneContent setter
+        # None: to be counted from sceneContent on first access
 
         self.isUnused = None
         # bool
@@ -210,9 +221,21 @@ class Scene:
         # str
         # xml: <ImageFile>
 
-        self.kwVar = {}
+        self._kwVar = None
         # dictionary
         # Optional key/value instance variables for customization.
+        # Created on first access, because most instances have none.
+
+    @property
+    def kwVar(self):
+        """Return the dictionary of custom keyword variables, creating it on first access."""
+        if self._kwVar is None:
+            self._kwVar = {}
+        return self._kwVar
+
+    @kwVar.setter
+    def kwVar(self, kwVar):
+        self._kwVar = kwVar
 
     @property
     def sceneContent(self):
@@ -220,16 +243,46 @@ class Scene:
 
     @sceneContent.setter
     def sceneContent(self, text):
-        """Set sceneContent updating word count and letter count."""
+        """Set sceneContent, invalidating word count and letter count."""
         self._sceneContent = text
-        text = re.sub('--|—|–|…', ' ', text)
-        # Make dashes separate words
-        text = re.sub('\[.+?\]|\/\*.+?\*\/|\.|\,|-', '', text)
-        # Remove comments and yWriter raw markup for word count; make hyphens join words
-        wordList = text.split()
-        self.wordCount = len(wordList)
-        text = re.sub('\[.+?\]|\/\*.+?\*\/', '', self._sceneContent)
-        # Remove yWriter raw markup for letter count
-        text = text.replace('\n', '')
-        text = text.replace('\r', '')
-        self.letterCount = len(text)
+        self._wordCount = None
+        self._letterCount = None
+
+    @property
+    def wordCount(self):
+        """Return the word count, counting the words of sceneContent, if necessary."""
+        if self._wordCount is None:
+            self._count()
+        return self._wordCount
+
+    @wordCount.setter
+    def wordCount(self, count):
+        self._wordCount = count
+
+    @property
+    def letterCount(self):
+        """Return the letter count, counting the letters of sceneContent, if necessary."""
+        if self._letterCount is None:
+            self._count()
+        return self._letterCount
+
+    @letterCount.setter
+    def letterCount(self, count):
+        self._letterCount = count
+
+    def _count(self):
+        """Count the words and letters of sceneContent, where not set otherwise.
+        
+        The markup is removed in a single regex pass; 
+        all other operations are plain string methods.
+        """
+        text = self._sceneContent.replace('--', '  ').replace('—', ' ').replace('–', ' ').replace('…', ' ')
+        # Make dashes separate words, keeping the text length
+        text = self._MARKUP.sub('', text)
+        # Remove comments and yWriter raw markup
+        if self._letterCount is None:
+            self._letterCount = len(text) - text.count('\n') - text.count('\r')
+        if self._wordCount is None:
+            text = text.replace('.', '').replace(',', '').replace('-', '')
+            # Make hyphens join words
+            self._wordCount = len(text.split())
@@ -16,6 +16,7 @@ class WorldElement:
         tags -- list of tags.
         aka -- str: alternate name.
     """
+    __slots__ = ('title', 'image', 'desc', 'tags', 'aka', '_kwVar')
 
     def __init__(self):
         """Initialize instance variables."""
@@ -39,6 +40,18 @@ class WorldElement:
         # str
         # xml: <AKA>
 
-        self.kwVar = {}
+        self._kwVar = None
         # dictionary
         # Optional key/value instance variables for customization.
+        # Created on first access, because most instances have none.
+
+    @property
+    def kwVar(self):
+        """Return the dictionary of custom keyword variables, creating it on first access."""
+        if self._kwVar is None:
+            self._kwVar = {}
+        return self._kwVar
+
+    @kwVar.setter
+    def kwVar(self, kwVar):
+        self._kwVar = kwVar
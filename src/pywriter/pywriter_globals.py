@@ -6,24 +6,50 @@ Published under the MIT License (https://opensource.org/licenses/mit-license.php
 """
 import os
 import sys
-import gettext
-import locale
 
 ERROR = '!'
 
-# Initialize localization.
+# Localization is initialized on the first translation,
+# so applications that never show a message don't pay for it.
 LOCALE_PATH = f'{os.path.dirname(sys.argv[0])}/locale/'
-try:
-    CURRENT_LANGUAGE = locale.getlocale()[0][:2]
-except:
-    # Fallback for old Windows versions.
-    CURRENT_LANGUAGE = locale.getdefaultlocale()[0][:2]
-try:
-    t = gettext.translation('pywriter', LOCALE_PATH, languages=[CURRENT_LANGUAGE])
-    _ = t.gettext
-except:
-
-    def _(message):
-        return message
-
-__all__ = ['ERROR', '_', 'LOCALE_PATH', 'CURRENT_LANGUAGE']
+_translate = None
+
+
+def get_current_language():
+    """Return the two-letter code of the current language."""
+    import locale
+    try:
+        return locale.getlocale()[0][:2]
+
+    except:
+        # Fallback for old Windows versions.
+        return locale.getdefaultlocale()[0][:2]
+
+
+def __getattr__(name):
+    """Return CURRENT_LANGUAGE, the two-letter code of the current language, detecting it on first access."""
+    if name == 'CURRENT_LANGUAGE':
+        global CURRENT_LANGUAGE
+        CURRENT_LANGUAGE = get_current_language()
+        return CURRENT_LANGUAGE
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def _(message):
+    """Return the translation of message, loading the message catalog on the first call."""
+    global _translate
+    if _translate is None:
+        _translate = str
+        if os.path.isdir(LOCALE_PATH):
+            import gettext
+            try:
+                t = gettext.translation('pywriter', LOCALE_PATH, languages=[get_current_language()])
+                _translate = t.gettext
+            except:
+                pass
+    return _translate(message)
+
+
+__all__ = ['ERROR', '_', 'LOCALE_PATH', 'get_current_language']
+# CURRENT_LANGUAGE is left out, so "import *" does not detect the language.
@@ -4,8 +4,6 @@ Copyright (c) 2022 Peter Triesberger
 For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
-import tkinter as tk
-from tkinter import messagebox
 from pywriter.pywriter_globals import *
 from pywriter.ui.ui import Ui
 
@@ -22,6 +20,9 @@ class UiTk(Ui):
 
     Public instance variables: 
         root -- tk root window.
+
+    tkinter is imported by the methods using it, so that the module can be 
+    part of a single-file script that also runs without a GUI.
     """
 
     def __init__(self, title):
@@ -32,6 +33,7 @@ class UiTk(Ui):
             
         Extends the superclass constructor.
         """
+        import tkinter as tk
         super().__init__(title)
         self._title = title
         self.root = tk.Tk()
@@ -54,6 +56,7 @@ class UiTk(Ui):
             
         Overrides the superclass method.       
         """
+        from tkinter import messagebox
         return messagebox.askyesno(_("WARNING"), text)
 
     def set_info_what(self, message):
@@ -97,10 +100,12 @@ class UiTk(Ui):
         Positional argument:
             open_cmd -- subclass method that opens the file.
         """
+        import tkinter as tk
         self.root.openButton = tk.Button(text=_("Open"), command=open_cmd)
         self.root.openButton.config(height=1, width=10)
         self.root.openButton.pack(pady=10)
 
     def show_warning(self, message):
         """Display a warning message box."""
+        from tkinter import messagebox
         messagebox.showwarning(self._title, message)
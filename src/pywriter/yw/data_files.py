@@ -8,6 +8,8 @@ import os
 import xml.etree.ElementTree as ET
 from pywriter.pywriter_globals import *
 from pywriter.yw.yw7_file import Yw7File
+from pywriter.yw.xml_indent import indent
+from pywriter.file.content_hash import is_unchanged
 
 
 class DataFiles(Yw7File):
@@ -22,6 +24,23 @@ class DataFiles(Yw7File):
     """
     DESCRIPTION = _('yWriter XML data files')
     EXTENSION = '.xml'
+    _SECTIONS = (('CHARACTERS', '_Characters'), ('LOCATIONS', '_Locations'), ('ITEMS', '_Items'))
+
+    def _build_element_tree(self):
+        """Build only the characters/locations/items subtrees.
+        
+        The subtrees are indented as if they were part of a yWriter project,
+        so the xml files look the same as extracted from a complete project.
+        Overrides the superclass method.
+        """
+        root = ET.Element('YWRITER7')
+        locations = ET.SubElement(root, 'LOCATIONS')
+        items = ET.SubElement(root, 'ITEMS')
+        characters = ET.SubElement(root, 'CHARACTERS')
+        self._build_world_subtrees(locations, items, characters)
+        for section in root:
+            indent(section, 1)
+        self.tree = ET.ElementTree(root)
 
     def _write_element_tree(self, ywProject):
         """Save the characters/locations/items subtrees as separate xml files
@@ -31,63 +50,43 @@ class DataFiles(Yw7File):
             
         Extract the characters/locations/items xml subtrees from a yWriter project.
         Generate the xml file paths from the .yw7 path and write each subtree to an xml file.
+        Files that already have the same content are left untouched.
         Return a message beginning with the ERROR constant in case of error.
+        Overrides the superclass method.
         """
         path, __ = os.path.splitext(ywProject.filePath)
-        characterPath = f'{path}_Characters.xml'
-        characterSubtree = ywProject.tree.find('CHARACTERS')
-        characterTree = ET.ElementTree(characterSubtree)
-        try:
-            characterTree.write(characterPath, xml_declaration=False, encoding='utf-8')
-        except(PermissionError):
-            return f'{ERROR}{_("File is write protected")}: "{os.path.normpath(characterPath)}".'
+        results = [self._write_xml_file(ywProject.tree.find(section), f'{path}{suffix}.xml')
+                   for section, suffix in self._SECTIONS]
+        for result in results:
+            if result.startswith(ERROR):
+                return result
 
-        locationPath = f'{path}_Locations.xml'
-        locationSubtree = ywProject.tree.find('LOCATIONS')
-        locationTree = ET.ElementTree(locationSubtree)
-        try:
-            locationTree.write(locationPath, xml_declaration=False, encoding='utf-8')
-        except(PermissionError):
-            return f'{ERROR}{_("File is write protected")}: "{os.path.normpath(locationPath)}".'
-
-        itemPath = f'{path}_Items.xml'
-        itemSubtree = ywProject.tree.find('ITEMS')
-        itemTree = ET.ElementTree(itemSubtree)
-        try:
-            itemTree.write(itemPath, xml_declaration=False, encoding='utf-8')
-        except(PermissionError):
-            return f'{ERROR}{_("File is write protected")}: "{os.path.normpath(itemPath)}".'
+        if not any(results):
+            return f'{_("No changes")}: "{os.path.normpath(path)}_*.xml".'
 
         return 'All XML data files written.'
 
-    def _postprocess_xml_file(self, filePath):
-        '''Postprocess three xml files created by ElementTree.
+    def _write_xml_file(self, xmlElement, xmlPath):
+        """Write an xml subtree to a file, unless the file already has the same content.
         
-        Positional argument:
-            filePath -- str: path to .yw7 xml file.
-            
-        Generate the xml file paths from the .yw7 path. 
-        Read, postprocess and write the characters, locations, and items xml files.        
-        Return a message beginning with the ERROR constant in case of error.
-        Extends the superclass method.
-        '''
-        path, __ = os.path.splitext(filePath)
-        characterPath = f'{path}_Characters.xml'
-        message = super()._postprocess_xml_file(characterPath)
-        if message.startswith(ERROR):
-            return message
+        Positional arguments:
+            xmlElement -- xml element to serialize.
+            xmlPath -- str: path of the xml file.
 
-        locationPath = f'{path}_Locations.xml'
-        message = super()._postprocess_xml_file(locationPath)
-        if message.startswith(ERROR):
-            return message
+        Return an empty string if the file is unchanged.
+        Return a message beginning with the ERROR constant in case of error.
+        """
+        text = self._to_xml_string(xmlElement)
+        if is_unchanged(xmlPath, text):
+            return ''
 
-        itemPath = f'{path}_Items.xml'
-        message = super()._postprocess_xml_file(itemPath)
-        if message.startswith(ERROR):
-            return message
+        try:
+            with open(xmlPath, 'w', encoding='utf-8') as f:
+                f.write(text)
+        except(PermissionError):
+            return f'{ERROR}{_("File is write protected")}: "{os.path.normpath(xmlPath)}".'
 
-        return 'All XML data files written.'
+        return f'{_("File written")}: "{os.path.normpath(xmlPath)}".'
 
     def merge(self, source):
         """Update instance variables from a source instance.
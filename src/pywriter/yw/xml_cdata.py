@@ -0,0 +1,81 @@
+"""Helper module for xml serialization with CDATA sections.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+XML_HEADER = '<?xml version="1.0" encoding="utf-8"?>\n'
+
+
+def to_xml_string(elem, cdataTags):
+    """Return an xml element tree as a string, with a header on top.
+
+    Positional arguments:
+        elem -- root element of the tree to serialize.
+        cdataTags -- collection of the tags whose text is to be written as CDATA.
+
+    The text of the elements listed in cdataTags is written unescaped
+    as a CDATA section. One leading " \\n" and one trailing "\\n" are
+    removed from such text, as yWriter does. All other text is
+    escaped as usual. The tree is processed in a single pass.
+    """
+    chunks = [XML_HEADER]
+    _serialize(chunks.append, elem, frozenset(cdataTags))
+    return ''.join(chunks)
+
+
+def _serialize(write, elem, cdataTags):
+    """Write an element, its subelements and its tail."""
+    tag = elem.tag
+    if elem.attrib:
+        attributes = ''.join(f' {key}="{_escape_attrib(value)}"' for key, value in elem.attrib.items())
+        write(f'<{tag}{attributes}')
+    else:
+        write(f'<{tag}')
+    text = elem.text
+    if text or len(elem):
+        write('>')
+        if text:
+            if tag in cdataTags and not len(elem):
+                if text.startswith(' \n'):
+                    text = text[2:]
+                if text.endswith('\n'):
+                    text = text[:-1]
+                write(f'<![CDATA[{text.replace("]]>", "]]]]><![CDATA[>")}]]>')
+            else:
+                write(_escape_text(text))
+        for subelement in elem:
+            _serialize(write, subelement, cdataTags)
+        write(f'</{tag}>')
+    else:
+        write(' />')
+    if elem.tail:
+        write(_escape_text(elem.tail))
+
+
+def _escape_text(text):
+    """Return text with xml special characters replaced by entities."""
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text
+
+
+def _escape_attrib(text):
+    """Return an attribute value with xml special characters and whitespace replaced by entities.
+
+    Line breaks and tabs are replaced as well, so they are preserved when the file is read.
+    """
+    text = _escape_text(text)
+    if '"' in text:
+        text = text.replace('"', '&quot;')
+    if '\r' in text:
+        text = text.replace('\r', '&#13;')
+    if '\n' in text:
+        text = text.replace('\n', '&#10;')
+    if '\t' in text:
+        text = text.replace('\t', '&#09;')
+    return text
@@ -7,13 +7,14 @@ For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import os
-import re
-from html import unescape
+import zlib
 import xml.etree.ElementTree as ET
 from pywriter.pywriter_globals import *
 from pywriter.model.novel import Novel
 from pywriter.model.splitter import Splitter
 from pywriter.yw.xml_indent import indent
+from pywriter.yw.xml_cdata import to_xml_string
+from pywriter.file.content_hash import is_unchanged
 
 
 class Yw7File(Novel):
@@ -39,7 +40,7 @@ class Yw7File(Novel):
                    'Notes', 'RTFFile', 'SceneContent',
                    'Outcome', 'Goal', 'Conflict']
     # Names of xml elements containing CDATA.
-    # ElementTree.write omits CDATA tags, so they have to be inserted afterwards.
+    # ElementTree.write omits CDATA tags, so the tree is serialized by to_xml_string().
 
     _PRJ_KWVAR = ()
     _CHP_KWVAR = ()
@@ -49,6 +50,9 @@ class Yw7File(Novel):
     _ITM_KWVAR = ()
     # Keyword variables for custom fields in the .yw7 XML file.
 
+    _CHECKSUM_FIELD = 'Field_ContentChecksum'
+    # Scene field holding the checksum of the content the word and letter counts refer to.
+
     def __init__(self, filePath, **kwargs):
         """Initialize instance variables.
         
@@ -325,20 +329,22 @@ class Yw7File(Novel):
             if scn.find('RTFFile') is not None:
                 self.scenes[scId].rtfFile = scn.find('RTFFile').text
 
-            # This is relevant for yW5 files with no SceneContent:
-            if scn.find('WordCount') is not None:
-                self.scenes[scId].wordCount = int(
-                    scn.find('WordCount').text)
-
-            if scn.find('LetterCount') is not None:
-                self.scenes[scId].letterCount = int(
-                    scn.find('LetterCount').text)
-
             if scn.find('SceneContent') is not None:
                 sceneContent = scn.find('SceneContent').text
                 if sceneContent is not None:
                     self.scenes[scId].sceneContent = sceneContent
 
+            # Keep the stored counts, if the content is missing (yW5 files),
+            # or unchanged since the counts were written. Otherwise, recount.
+            if self.scenes[scId].sceneContent is None or self._has_valid_counts(scn):
+                if scn.find('WordCount') is not None:
+                    self.scenes[scId].wordCount = int(
+                        scn.find('WordCount').text)
+
+                if scn.find('LetterCount') is not None:
+                    self.scenes[scId].letterCount = int(
+                        scn.find('LetterCount').text)
+
             if scn.find('Unused') is not None:
                 self.scenes[scId].isUnused = True
             else:
@@ -495,14 +501,42 @@ class Yw7File(Novel):
 
         def merge_lists(srcLst, tgtLst):
             """Insert srcLst items to tgtLst, if missing.
+            
+            A missing item is inserted after the item preceding it in srcLst.
+            tgtLst is processed as a linked list indexed by its items,
+            so this runs in linear time. If tgtLst has duplicate items,
+            it is processed by index lookups instead, which is slower.
             """
-            j = 0
-            for i in range(len(srcLst)):
-                if not srcLst[i] in tgtLst:
-                    tgtLst.insert(j, srcLst[i])
-                    j += 1
-                else:
-                    j = tgtLst.index(srcLst[i]) + 1
+            if len(set(tgtLst)) != len(tgtLst):
+                j = 0
+                for item in srcLst:
+                    if not item in tgtLst:
+                        tgtLst.insert(j, item)
+                        j += 1
+                    else:
+                        j = tgtLst.index(item) + 1
+                return
+
+            head = object()
+            successors = {}
+            # key: item, value: next item in tgtLst.
+            predecessor = head
+            for item in tgtLst:
+                successors[predecessor] = item
+                predecessor = item
+            successors[predecessor] = None
+            cursor = head
+            for item in srcLst:
+                if not item in successors:
+                    successors[item] = successors[cursor]
+                    successors[cursor] = item
+                cursor = item
+            mergedLst = []
+            item = successors[head]
+            while item is not None:
+                mergedLst.append(item)
+                item = successors[item]
+            tgtLst[:] = mergedLst
 
         if os.path.isfile(self.filePath):
             message = self.read()
@@ -767,9 +801,10 @@ class Yw7File(Novel):
             # The scene's sort order may not change.
 
             # Remove scenes that have been moved to another chapter from the scene list.
+            sourceScenes = set(source.chapters[chId].srtScenes)
             srtScenes = []
             for scId in self.chapters[chId].srtScenes:
-                if scId in source.chapters[chId].srtScenes or not scId in source.scenes:
+                if scId in sourceScenes or not scId in source.scenes:
                     # The scene has not moved to another chapter or isn't imported
                     srtScenes.append(scId)
             self.chapters[chId].srtScenes = srtScenes
@@ -826,11 +861,7 @@ class Yw7File(Novel):
             return f'{ERROR}{_("yWriter seems to be open. Please close first")}.'
 
         self._build_element_tree()
-        message = self._write_element_tree(self)
-        if message.startswith(ERROR):
-            return message
-
-        return self._postprocess_xml_file(self.filePath)
+        return self._write_element_tree(self)
 
     def is_locked(self):
         """Check whether the yw7 file is locked by yWriter.
@@ -850,10 +881,8 @@ class Yw7File(Novel):
                 except(AttributeError):
                     ET.SubElement(xmlScn, 'Title').text = prjScn.title
             if xmlScn.find('BelongsToChID') is None:
-                for chId in self.chapters:
-                    if scId in self.chapters[chId].srtScenes:
-                        ET.SubElement(xmlScn, 'BelongsToChID').text = chId
-                        break
+                if scId in chapterIds:
+                    ET.SubElement(xmlScn, 'BelongsToChID').text = chapterIds[scId]
 
             if prjScn.desc is not None:
                 try:
@@ -1196,6 +1225,181 @@ class Yw7File(Novel):
                 for scId in prjChp.srtScenes:
                     ET.SubElement(sortSc, 'ScID').text = scId
 
+        def build_project_subtree(xmlPrj):
+            VER = '7'
+            try:
+                xmlPrj.find('Ver').text = VER
+            except(AttributeError):
+                ET.SubElement(xmlPrj, 'Ver').text = VER
+
+            if self.title is not None:
+                try:
+                    xmlPrj.find('Title').text = self.title
+                except(AttributeError):
+                    ET.SubElement(xmlPrj, 'Title').text = self.title
+
+            if self.desc is not None:
+                try:
+                    xmlPrj.find('Desc').text = self.desc
+                except(AttributeError):
+                    ET.SubElement(xmlPrj, 'Desc').text = self.desc
+
+            if self.authorName is not None:
+                try:
+                    xmlPrj.find('AuthorName').text = self.authorName
+                except(AttributeError):
+                    ET.SubElement(xmlPrj, 'AuthorName').text = self.authorName
+
+            if self.authorBio is not None:
+                try:
+                    xmlPrj.find('Bio').text = self.authorBio
+                except(AttributeError):
+                    ET.SubElement(xmlPrj, 'Bio').text = self.authorBio
+
+            if self.fieldTitle1 is not None:
+                try:
+                    xmlPrj.find('FieldTitle1').text = self.fieldTitle1
+                except(AttributeError):
+                    ET.SubElement(xmlPrj, 'FieldTitle1').text = self.fieldTitle1
+
+            if self.fieldTitle2 is not None:
+                try:
+                    xmlPrj.find('FieldTitle2').text = self.fieldTitle2
+                except(AttributeError):
+                    ET.SubElement(xmlPrj, 'FieldTitle2').text = self.fieldTitle2
+
+            if self.fieldTitle3 is not None:
+                try:
+                    xmlPrj.find('FieldTitle3').text = self.fieldTitle3
+                except(AttributeError):
+                    ET.SubElement(xmlPrj, 'FieldTitle3').text = self.fieldTitle3
+
+            if self.fieldTitle4 is not None:
+                try:
+                    xmlPrj.find('FieldTitle4').text = self.fieldTitle4
+                except(AttributeError):
+                    ET.SubElement(xmlPrj, 'FieldTitle4').text = self.fieldTitle4
+
+            #--- Write project custom fields.
+            prjFields = xmlPrj.find('Fields')
+            for field in self._PRJ_KWVAR:
+                setting = self.kwVar[field]
+                if setting:
+                    if prjFields is None:
+                        prjFields = ET.SubElement(xmlPrj, 'Fields')
+                    try:
+                        prjFields.find(field).text = setting
+                    except(AttributeError):
+                        ET.SubElement(prjFields, field).text = setting
+                else:
+                    try:
+                        prjFields.remove(prjFields.find(field))
+                    except:
+                        pass
+
+        TAG = 'YWRITER7'
+        xmlScenes = {}
+        xmlChapters = {}
+        try:
+            # Try processing an existing tree.
+            root = self.tree.getroot()
+            xmlPrj = root.find('PROJECT')
+            locations = root.find('LOCATIONS')
+            items = root.find('ITEMS')
+            characters = root.find('CHARACTERS')
+            scenes = root.find('SCENES')
+            chapters = root.find('CHAPTERS')
+        except(AttributeError):
+            # Build a new tree.
+            root = ET.Element(TAG)
+            xmlPrj = ET.SubElement(root, 'PROJECT')
+            locations = ET.SubElement(root, 'LOCATIONS')
+            items = ET.SubElement(root, 'ITEMS')
+            characters = ET.SubElement(root, 'CHARACTERS')
+            scenes = ET.SubElement(root, 'SCENES')
+            chapters = ET.SubElement(root, 'CHAPTERS')
+
+        #--- Process project attributes.
+
+        build_project_subtree(xmlPrj)
+
+        #--- Process locations, items, and characters.
+
+        self._build_world_subtrees(locations, items, characters)
+
+        #--- Process scenes.
+
+        # Map the scene IDs to the IDs of the chapters they belong to.
+        chapterIds = {}
+        for chId in self.chapters:
+            for scId in self.chapters[chId].srtScenes:
+                if not scId in chapterIds:
+                    chapterIds[scId] = chId
+
+        # Save the original XML scene subtrees
+        # and remove them from the project tree.
+        for xmlScn in scenes.findall('SCENE'):
+            scId = xmlScn.find('ID').text
+            xmlScenes[scId] = xmlScn
+            scenes.remove(xmlScn)
+
+        # Add the new XML scene subtrees to the project tree.
+        for scId in self.scenes:
+            if not scId in xmlScenes:
+                xmlScenes[scId] = ET.Element('SCENE')
+                ET.SubElement(xmlScenes[scId], 'ID').text = scId
+            build_scene_subtree(xmlScenes[scId], self.scenes[scId])
+            scenes.append(xmlScenes[scId])
+
+        #--- Process chapters.
+
+        # Save the original XML chapter subtree
+        # and remove it from the project tree.
+        for xmlChp in chapters.findall('CHAPTER'):
+            chId = xmlChp.find('ID').text
+            xmlChapters[chId] = xmlChp
+            chapters.remove(xmlChp)
+
+        # Add the new XML chapter subtrees to the project tree.
+        sortOrder = 0
+        for chId in self.srtChapters:
+            sortOrder += 1
+            if not chId in xmlChapters:
+                xmlChapters[chId] = ET.Element('CHAPTER')
+                ET.SubElement(xmlChapters[chId], 'ID').text = chId
+            build_chapter_subtree(xmlChapters[chId], self.chapters[chId], sortOrder)
+            chapters.append(xmlChapters[chId])
+
+        # Modify the scene contents of an existing xml element tree.
+        for scn in root.iter('SCENE'):
+            scId = scn.find('ID').text
+            if self.scenes[scId].sceneContent is not None:
+                scn.find('SceneContent').text = self.scenes[scId].sceneContent
+                scn.find('WordCount').text = str(self.scenes[scId].wordCount)
+                scn.find('LetterCount').text = str(self.scenes[scId].letterCount)
+                scFields = scn.find('Fields')
+                if scFields is None:
+                    scFields = ET.SubElement(scn, 'Fields')
+                try:
+                    scFields.find(self._CHECKSUM_FIELD).text = self._content_checksum(self.scenes[scId].sceneContent)
+                except(AttributeError):
+                    ET.SubElement(scFields, self._CHECKSUM_FIELD).text = self._content_checksum(self.scenes[scId].sceneContent)
+            try:
+                scn.remove(scn.find('RTFFile'))
+            except:
+                pass
+        indent(root)
+        self.tree = ET.ElementTree(root)
+
+    def _build_world_subtrees(self, locations, items, characters):
+        """Rebuild the locations, items, and characters subtrees.
+        
+        Positional arguments:
+            locations -- LOCATIONS xml element.
+            items -- ITEMS xml element.
+            characters -- CHARACTERS xml element.
+        """
+
         def build_location_subtree(xmlLoc, prjLoc, sortOrder):
             ET.SubElement(xmlLoc, 'ID').text = lcId
             if prjLoc.title is not None:
@@ -1318,104 +1522,6 @@ class Yw7File(Novel):
                     except:
                         pass
 
-        def build_project_subtree(xmlPrj):
-            VER = '7'
-            try:
-                xmlPrj.find('Ver').text = VER
-            except(AttributeError):
-                ET.SubElement(xmlPrj, 'Ver').text = VER
-
-            if self.title is not None:
-                try:
-                    xmlPrj.find('Title').text = self.title
-                except(AttributeError):
-                    ET.SubElement(xmlPrj, 'Title').text = self.title
-
-            if self.desc is not None:
-                try:
-                    xmlPrj.find('Desc').text = self.desc
-                except(AttributeError):
-                    ET.SubElement(xmlPrj, 'Desc').text = self.desc
-
-            if self.authorName is not None:
-                try:
-                    xmlPrj.find('AuthorName').text = self.authorName
-                except(AttributeError):
-                    ET.SubElement(xmlPrj, 'AuthorName').text = self.authorName
-
-            if self.authorBio is not None:
-                try:
-                    xmlPrj.find('Bio').text = self.authorBio
-                except(AttributeError):
-                    ET.SubElement(xmlPrj, 'Bio').text = self.authorBio
-
-            if self.fieldTitle1 is not None:
-                try:
-                    xmlPrj.find('FieldTitle1').text = self.fieldTitle1
-                except(AttributeError):
-                    ET.SubElement(xmlPrj, 'FieldTitle1').text = self.fieldTitle1
-
-            if self.fieldTitle2 is not None:
-                try:
-                    xmlPrj.find('FieldTitle2').text = self.fieldTitle2
-                except(AttributeError):
-                    ET.SubElement(xmlPrj, 'FieldTitle2').text = self.fieldTitle2
-
-            if self.fieldTitle3 is not None:
-                try:
-                    xmlPrj.find('FieldTitle3').text = self.fieldTitle3
-                except(AttributeError):
-                    ET.SubElement(xmlPrj, 'FieldTitle3').text = self.fieldTitle3
-
-            if self.fieldTitle4 is not None:
-                try:
-                    xmlPrj.find('FieldTitle4').text = self.fieldTitle4
-                except(AttributeError):
-                    ET.SubElement(xmlPrj, 'FieldTitle4').text = self.fieldTitle4
-
-            #--- Write project custom fields.
-            prjFields = xmlPrj.find('Fields')
-            for field in self._PRJ_KWVAR:
-                setting = self.kwVar[field]
-                if setting:
-                    if prjFields is None:
-                        prjFields = ET.SubElement(xmlPrj, 'Fields')
-                    try:
-                        prjFields.find(field).text = setting
-                    except(AttributeError):
-                        ET.SubElement(prjFields, field).text = setting
-                else:
-                    try:
-                        prjFields.remove(prjFields.find(field))
-                    except:
-                        pass
-
-        TAG = 'YWRITER7'
-        xmlScenes = {}
-        xmlChapters = {}
-        try:
-            # Try processing an existing tree.
-            root = self.tree.getroot()
-            xmlPrj = root.find('PROJECT')
-            locations = root.find('LOCATIONS')
-            items = root.find('ITEMS')
-            characters = root.find('CHARACTERS')
-            scenes = root.find('SCENES')
-            chapters = root.find('CHAPTERS')
-        except(AttributeError):
-            # Build a new tree.
-            root = ET.Element(TAG)
-            xmlPrj = ET.SubElement(root, 'PROJECT')
-            locations = ET.SubElement(root, 'LOCATIONS')
-            items = ET.SubElement(root, 'ITEMS')
-            characters = ET.SubElement(root, 'CHARACTERS')
-            scenes = ET.SubElement(root, 'SCENES')
-            chapters = ET.SubElement(root, 'CHAPTERS')
-
-        #--- Process project attributes.
-
-        build_project_subtree(xmlPrj)
-
         #--- Process locations.
 
         # Remove LOCATION entries in order to rewrite
@@ -1458,108 +1564,56 @@ class Yw7File(Novel):
             xmlCrt = ET.SubElement(characters, 'CHARACTER')
             build_character_subtree(xmlCrt, self.characters[crId], sortOrder)
 
-        #--- Process scenes.
-
-        # Save the original XML scene subtrees
-        # and remove them from the project tree.
-        for xmlScn in scenes.findall('SCENE'):
-            scId = xmlScn.find('ID').text
-            xmlScenes[scId] = xmlScn
-            scenes.remove(xmlScn)
-
-        # Add the new XML scene subtrees to the project tree.
-        for scId in self.scenes:
-            if not scId in xmlScenes:
-                xmlScenes[scId] = ET.Element('SCENE')
-                ET.SubElement(xmlScenes[scId], 'ID').text = scId
-            build_scene_subtree(xmlScenes[scId], self.scenes[scId])
-            scenes.append(xmlScenes[scId])
-
-        #--- Process chapters.
-
-        # Save the original XML chapter subtree
-        # and remove it from the project tree.
-        for xmlChp in chapters.findall('CHAPTER'):
-            chId = xmlChp.find('ID').text
-            xmlChapters[chId] = xmlChp
-            chapters.remove(xmlChp)
-
-        # Add the new XML chapter subtrees to the project tree.
-        sortOrder = 0
-        for chId in self.srtChapters:
-            sortOrder += 1
-            if not chId in xmlChapters:
-                xmlChapters[chId] = ET.Element('CHAPTER')
-                ET.SubElement(xmlChapters[chId], 'ID').text = chId
-            build_chapter_subtree(xmlChapters[chId], self.chapters[chId], sortOrder)
-            chapters.append(xmlChapters[chId])
-
-        # Modify the scene contents of an existing xml element tree.
-        for scn in root.iter('SCENE'):
-            scId = scn.find('ID').text
-            if self.scenes[scId].sceneContent is not None:
-                scn.find('SceneContent').text = self.scenes[scId].sceneContent
-                scn.find('WordCount').text = str(self.scenes[scId].wordCount)
-                scn.find('LetterCount').text = str(self.scenes[scId].letterCount)
-            try:
-                scn.remove(scn.find('RTFFile'))
-            except:
-                pass
-        indent(root)
-        self.tree = ET.ElementTree(root)
-
     def _write_element_tree(self, ywProject):
         """Write back the xml element tree to a .yw7 xml file located at filePath.
         
+        Serialize the tree in a single pass, with a header on top and 
+        the CDATA sections inserted, and write the xml file.
+        If the file already has the same content, leave it and its backup untouched.
         Return a message beginning with the ERROR constant in case of error.
         """
+        text = self._to_xml_string(ywProject.tree.getroot())
+        if is_unchanged(ywProject.filePath, text):
+            return f'{_("No changes")}: "{os.path.normpath(ywProject.filePath)}".'
+
         if os.path.isfile(ywProject.filePath):
             os.replace(ywProject.filePath, f'{ywProject.filePath}.bak')
             backedUp = True
         else:
             backedUp = False
         try:
-            ywProject.tree.write(ywProject.filePath, xml_declaration=False, encoding='utf-8')
+            with open(ywProject.filePath, 'w', encoding='utf-8') as f:
+                f.write(text)
         except:
             if backedUp:
                 os.replace(f'{ywProject.filePath}.bak', ywProject.filePath)
             return f'{ERROR}{_("Cannot write file")}: "{os.path.normpath(ywProject.filePath)}".'
 
-        return 'yWriter XML tree written.'
+        return f'{_("File written")}: "{os.path.normpath(ywProject.filePath)}".'
 
-    def _postprocess_xml_file(self, filePath):
-        '''Postprocess an xml file created by ElementTree.
+    def _to_xml_string(self, xmlElement):
+        """Return the xml element serialized with a header on top and the CDATA sections inserted.
         
         Positional argument:
-            filePath -- str: path to xml file.
-        
-        Read the xml file, put a header on top, insert the missing CDATA tags,
-        and replace xml entities by plain text (unescape). Overwrite the .yw7 xml file.
-        Return a message beginning with the ERROR constant in case of error.
+            xmlElement -- xml element to serialize.
+        """
+        return to_xml_string(xmlElement, self._CDATA_TAGS)
+
+    def _has_valid_counts(self, xmlScn):
+        """Return True if the scene's stored counts refer to its stored content.
         
-        Note: The path is given as an argument rather than using self.filePath. 
-        So this routine can be used for yWriter-generated xml files other than .yw7 as well. 
-        '''
-        with open(filePath, 'r', encoding='utf-8') as f:
-            text = f.read()
-        lines = text.split('\n')
-        newlines = ['<?xml version="1.0" encoding="utf-8"?>']
-        for line in lines:
-            for tag in self._CDATA_TAGS:
-                line = re.sub(f'\<{tag}\>', f'<{tag}><![CDATA[', line)
-                line = re.sub(f'\<\/{tag}\>', f']]></{tag}>', line)
-            newlines.append(line)
-        text = '\n'.join(newlines)
-        text = text.replace('[CDATA[ \n', '[CDATA[')
-        text = text.replace('\n]]', ']]')
-        text = unescape(text)
-        try:
-            with open(filePath, 'w', encoding='utf-8') as f:
-                f.write(text)
-        except:
-            return f'{ERROR}{_("Cannot write file")}: "{os.path.normpath(filePath)}".'
+        Positional argument:
+            xmlScn -- SCENE xml element.
+        """
+        checksum = xmlScn.find(f'Fields/{self._CHECKSUM_FIELD}')
+        if checksum is None:
+            return False
+
+        return checksum.text == self._content_checksum(xmlScn.find('SceneContent').text)
 
-        return f'{_("File written")}: "{os.path.normpath(filePath)}".'
+    def _content_checksum(self, text):
+        """Return a CRC32 checksum of a scene content as a hex string."""
+        return f'{zlib.crc32(text.encode("utf-8")):08x}'
 
     def _strip_spaces(self, lines):
         """Local helper method.
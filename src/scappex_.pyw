@@ -8,10 +8,9 @@ Published under the MIT License (https://opensource.org/licenses/mit-license.php
 """
 import os
 import argparse
-from pathlib import Path
+import time
 from pywriter.ui.ui import Ui
-from pywriter.ui.ui_tk import UiTk
-from pywriter.config.configuration import Configuration
+from scappexlib.scap_configuration import ScapConfiguration
 from scappexlib.scap_converter import ScapConverter
 
 SUFFIX = ''
@@ -25,53 +24,114 @@ SETTINGS = dict(
     item_color=GREEN,
     major_chara_color=RED,
     minor_chara_color=PURPLE,
+    color_tags='',
+    scene_row_tolerance='0',
+    chapter_layout='single',
+    chapter_gap='50',
 )
 OPTIONS = dict(
     export_scenes=True,
     export_characters=True,
     export_locations=True,
     export_items=True,
+    use_cache=False,
 )
 
 
-def run(sourcePath, silentMode=True, installDir='.'):
+def get_configuration(sourcePath, installDir='.'):
+    """Return the keyword arguments for the conversion of sourcePath."""
+    configuration = ScapConfiguration(APPNAME, SETTINGS, OPTIONS, installDir)
+    return configuration.get_kwargs(sourcePath, SUFFIX)
+
+
+def run(sourcePath, silentMode=True, installDir='.', tracePath=None):
     if silentMode:
         ui = Ui('')
     else:
+        from pywriter.ui.ui_tk import UiTk
         ui = UiTk('Scapple to yWriter converter @release')
-
-    #--- Try to get persistent configuration data
-    sourceDir = os.path.dirname(sourcePath)
-    if not sourceDir:
-        sourceDir = '.'
-    iniFileName = f'{APPNAME}.ini'
-    iniFiles = [f'{installDir}/{iniFileName}', f'{sourceDir}/{iniFileName}']
-    configuration = Configuration(SETTINGS, OPTIONS)
-    for iniFile in iniFiles:
-        configuration.read(iniFile)
-    kwargs = {'suffix': SUFFIX}
-    kwargs.update(configuration.settings)
-    kwargs.update(configuration.options)
+    kwargs = get_configuration(sourcePath, installDir)
     converter = ScapConverter()
     converter.ui = ui
-    converter.run(sourcePath, **kwargs)
+    if tracePath:
+        from scappexlib.scap_tracer import ScapTracer
+        tracer = ScapTracer()
+        tracer.trace_conversion()
+        try:
+            converter.run(sourcePath, **kwargs)
+        finally:
+            tracer.restore()
+            tracer.write(tracePath)
+    else:
+        converter.run(sourcePath, **kwargs)
     ui.start()
 
 
+def run_batch(sources, listFile=None, workers=None, reportPath=None, installDir='.'):
+    from scappexlib.scap_batch import ScapBatch
+    batch = ScapBatch(APPNAME, SETTINGS, OPTIONS, installDir, SUFFIX)
+    sourcePaths = batch.collect(sources, listFile)
+    startTime = time.perf_counter()
+    results = batch.run(sourcePaths, workers)
+    failed = len([result for result in results if result[1] != 'OK'])
+    if reportPath:
+        batch.write_report(results, reportPath)
+    print(f'{len(results)} files converted in {time.perf_counter() - startTime:.1f} seconds, {failed} failed.')
+    return results
+
+
+def run_watch(sourcePath, installDir='.', maxSyncs=None):
+    from scappexlib.scap_watcher import ScapWatcher
+    watcher = ScapWatcher(sourcePath, **get_configuration(sourcePath, installDir))
+    print(f'Watching "{os.path.normpath(sourcePath)}". Press Ctrl-C to stop.')
+    try:
+        for message in watcher.watch(maxSyncs):
+            print(f'{time.strftime("%H:%M:%S")} {message}')
+    except KeyboardInterrupt:
+        pass
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(
         description='Scapple to yWriter converter',
         epilog='')
     parser.add_argument('sourcePath',
                         metavar='Sourcefile',
-                        help='The path of the Scapple file.')
+                        nargs='*',
+                        help='The path of the Scapple file. In batch mode, also directories or glob patterns.')
     parser.add_argument('--silent',
                         action="store_true",
                         help='suppress error messages and the request to confirm overwriting')
+    parser.add_argument('--watch',
+                        action="store_true",
+                        help='keep the yWriter project in sync with the Scapple file until interrupted')
+    parser.add_argument('--trace',
+                        metavar='Tracefile',
+                        help='write the time spent in each conversion stage to a Chrome trace-event JSON file')
+    parser.add_argument('--batch',
+                        action="store_true",
+                        help='convert several Scapple files in parallel without user interaction')
+    parser.add_argument('--filelist',
+                        metavar='Listfile',
+                        help='batch mode: text file listing the Scapple files, one per line')
+    parser.add_argument('--workers',
+                        type=int,
+                        help='batch mode: number of worker processes (default: number of CPUs)')
+    parser.add_argument('--report',
+                        metavar='Reportfile',
+                        default=f'{APPNAME}_report.csv',
+                        help='batch mode: path of the CSV conversion report')
     args = parser.parse_args()
     try:
-        homeDir = str(Path.home()).replace('\\', '/')
+        homeDir = os.path.expanduser('~').replace('\\', '/')
         installDir = f'{homeDir}/.pywriter/{APPNAME}/config'
     except:
         installDir = '.'
-    run(args.sourcePath, args.silent, installDir)
+    if args.batch or args.filelist:
+        run_batch(args.sourcePath, args.filelist, args.workers, args.report, installDir)
+    elif len(args.sourcePath) == 1 and args.watch:
+        run_watch(args.sourcePath[0], installDir)
+    elif len(args.sourcePath) == 1:
+        run(args.sourcePath[0], args.silent, installDir, args.trace)
+    else:
+        parser.error('exactly one Sourcefile is required unless --batch is given')
@@ -4,7 +4,20 @@ Modules:
 
 scap_file -- Provide a class for Scapple file representation.
 scap_note -- Provide a class for Scapple note representation.
+scap_note_table -- Provide a class for the column-oriented note table of a Scapple board.
+scap_shape -- Provide a class for Scapple background shape representation.
+scap_shape_index -- Provide a class for the spatial index of Scapple background shapes.
+scap_color -- Provide a class for Scapple text color classification.
+scap_graph -- Provide a class for the connection graph of a Scapple board.
+scap_id_ranges -- Provide a class for compact Scapple note ID lists.
+scap_reader -- Provide a class for streaming Scapple note parsing.
 scap_converter -- Provide a Scapple converter class for Scapple diagram import.
+scap_configuration -- Provide a class for the configuration of a Scapple file conversion.
+scap_batch -- Provide a class for parallel batch conversion of Scapple files.
+scap_cache -- Provide a class for the persistent conversion cache of a Scapple board.
+scap_watcher -- Provide a class for continuous Scapple to yWriter synchronization.
+scap_warm_project -- Provide a class for a yWriter project kept in memory between conversions.
+scap_tracer -- Provide a class for tracing the conversion stages.
 
 Copyright (c) 2022 Peter Triesberger
 For further information see https://github.com/peter88213/scappex
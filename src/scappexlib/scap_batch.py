@@ -0,0 +1,147 @@
+"""Provide a class for parallel batch conversion of Scapple files.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/scappex
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import glob
+import time
+from scappexlib.scap_configuration import ScapConfiguration
+from scappexlib.scap_converter import ScapConverter
+from scappexlib.scap_file import ScapFile
+
+
+class ScapBatch:
+    """Batch converter distributing Scapple file conversions to a process pool.
+
+    Public methods:
+        collect(sources, listFile) -- Return the Scapple file paths given by sources and listFile.
+        run(sourcePaths, workers) -- Convert the Scapple files and return the results.
+        write_report(results, reportPath) -- Write a CSV report of the conversion results.
+
+    Each worker process pays the interpreter startup and import cost
+    only once, and then converts any number of files.
+    """
+    REPORT_FIELDS = ('file', 'status', 'seconds', 'message')
+
+    def __init__(self, appName, settings, options, installDir='.', suffix=''):
+        """Store the configuration to be passed to the workers.
+
+        Positional arguments:
+            appName -- str: application name; determines the INI file name.
+            settings -- dict: default settings.
+            options -- dict: default options.
+
+        Optional arguments:
+            installDir -- str: path to the global configuration directory.
+            suffix -- str: file name suffix passed to the converter.
+        """
+        self._config = (ScapConfiguration(appName, settings, options, installDir), suffix)
+
+    def collect(self, sources, listFile=None):
+        """Return the Scapple file paths given by sources and listFile.
+
+        Positional arguments:
+            sources -- list of str: Scapple file paths, directories, or glob patterns.
+
+        Optional arguments:
+            listFile -- str: path to a text file listing Scapple file paths, one per line.
+
+        Directories contribute the Scapple files they contain.
+        Duplicates are removed; the order of first appearance is kept.
+        """
+        candidates = list(sources)
+        if listFile:
+            with open(listFile, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith('#'):
+                        candidates.append(line)
+        sourcePaths = []
+        for candidate in candidates:
+            if os.path.isdir(candidate):
+                sourcePaths.extend(sorted(glob.glob(os.path.join(glob.escape(candidate), f'*{ScapFile.EXTENSION}'))))
+            elif glob.has_magic(candidate):
+                sourcePaths.extend(sorted(glob.glob(candidate, recursive=True)))
+            else:
+                sourcePaths.append(candidate)
+        return list(dict.fromkeys(sourcePaths))
+
+    def run(self, sourcePaths, workers=None):
+        """Convert the Scapple files and return the results.
+
+        Positional arguments:
+            sourcePaths -- list of str: paths of the Scapple files to convert.
+
+        Optional arguments:
+            workers -- int: number of worker processes. Default: number of CPUs.
+
+        Return a list of (file, status, seconds, message) tuples in the order of sourcePaths.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = max(1, min(workers, len(sourcePaths)))
+        if workers == 1:
+            init_batch_worker(self._config)
+            return [convert_batch_file(sourcePath) for sourcePath in sourcePaths]
+
+        from multiprocessing import Pool
+        chunkSize = max(1, len(sourcePaths) // (workers * 4))
+        with Pool(workers, init_batch_worker, (self._config,)) as pool:
+            return pool.map(convert_batch_file, sourcePaths, chunkSize)
+
+    def write_report(self, results, reportPath):
+        """Write a CSV report of the conversion results.
+
+        Positional arguments:
+            results -- list of (file, status, seconds, message) tuples.
+            reportPath -- str: path of the report file.
+        """
+        import csv
+        with open(reportPath, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.REPORT_FIELDS)
+            for sourcePath, status, seconds, message in results:
+                writer.writerow((sourcePath, status, f'{seconds:.3f}', message))
+
+
+_batchConfig = None
+# (ScapConfiguration instance, suffix) of the current worker process, set by init_batch_worker().
+
+
+def init_batch_worker(config):
+    """Initialize a batch worker process.
+
+    Positional arguments:
+        config -- tuple: (ScapConfiguration instance, suffix).
+    """
+    global _batchConfig
+    _batchConfig = config
+
+
+def convert_batch_file(sourcePath):
+    """Convert a single Scapple file in a batch worker process.
+
+    Positional arguments:
+        sourcePath -- str: path of the Scapple file.
+
+    Return a (file, status, seconds, message) tuple.
+    """
+    configuration, suffix = _batchConfig
+    startTime = time.perf_counter()
+    kwargs = configuration.get_kwargs(sourcePath, suffix)
+    converter = ScapConverter()
+    try:
+        converter.run(sourcePath, **kwargs)
+        message = converter.ui.infoHowText
+    except Exception as ex:
+        converter.newFile = None
+        message = str(ex)
+    if converter.newFile is None:
+        status = 'FAIL'
+        if message.startswith('FAIL: '):
+            message = message[len('FAIL: '):]
+    else:
+        status = 'OK'
+    return sourcePath, status, time.perf_counter() - startTime, message
@@ -0,0 +1,139 @@
+"""Provide a class for the persistent conversion cache of a Scapple board.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/scappex
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+from pywriter.pywriter_globals import ERROR
+
+
+class ScapCache:
+    """Sidecar cache recording the state of a Scapple board at the last conversion.
+
+    Public methods:
+        is_unchanged(targetPaths, fingerprints) -- Return True if neither the board nor the targets changed since the last run.
+        save(targetPaths) -- Write the cache file.
+
+    Public instance variables:
+        filePath -- str: path to the cache file.
+
+    The cache file is placed next to the board. It holds a digest of the board,
+    the fingerprints of its notes, a fingerprint of the configuration, and
+    the size and modification time of the generated files. A cache written
+    with a different configuration or format version is ignored.
+    """
+    VERSION = 2
+    SUFFIX = '.cache'
+    CHUNK_SIZE = 65536
+
+    def __init__(self, boardPath, config):
+        """Compute the board digest and load the cache file, if any.
+
+        Positional arguments:
+            boardPath -- str: path to the Scapple file.
+            config -- dict: settings and options the conversion depends on.
+        """
+        import json
+        import hashlib
+        self.filePath = f'{boardPath}{self.SUFFIX}'
+        self._config = hashlib.sha1(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()
+        self._boardDigest = self._file_digest(boardPath)
+        self._lastBoardDigest = None
+        self._lastNotes = None
+        self._lastTargets = {}
+        try:
+            with open(self.filePath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data['version'] == self.VERSION and data['config'] == self._config:
+                self._lastBoardDigest = data['board']
+                self._lastNotes = data['notes']
+                self._lastTargets = data['targets']
+        except:
+            pass
+        self._notes = None
+        # Fingerprints of the notes read in this run.
+
+    def is_unchanged(self, targetPaths, fingerprints=None):
+        """Return True if neither the board nor the targets changed since the last run.
+
+        Positional arguments:
+            targetPaths -- list of str: paths to the files generated from the board.
+
+        Optional arguments:
+            fingerprints -- list of int: fingerprints of the notes read from the board.
+
+        Without fingerprints, the board file is compared, so the board need not be read.
+        With fingerprints, the notes are compared instead; then a board saved 
+        with changes to the view or the styles only is unchanged as well.
+        The fingerprints are kept for the cache file.
+        """
+        if fingerprints is None:
+            if self._boardDigest is None or self._boardDigest != self._lastBoardDigest:
+                return False
+
+        else:
+            self._notes = list(fingerprints)
+            if self._notes != self._lastNotes:
+                return False
+
+        targetStats = self._target_stats(targetPaths)
+        if None in targetStats.values():
+            return False
+
+        return targetStats == self._lastTargets
+
+    def save(self, targetPaths):
+        """Write the cache file.
+
+        Positional arguments:
+            targetPaths -- list of str: paths to the files generated from the board.
+
+        Return a message beginning with the ERROR constant in case of error.
+        """
+        import json
+        data = dict(
+            version=self.VERSION,
+            config=self._config,
+            board=self._boardDigest,
+            notes=self._notes,
+            targets=self._target_stats(targetPaths),
+            )
+        try:
+            with open(self.filePath, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except:
+            return f'{ERROR}Cannot write "{os.path.normpath(self.filePath)}".'
+
+        return f'Cache written: "{os.path.normpath(self.filePath)}".'
+
+    def _file_digest(self, filePath):
+        """Return the SHA-1 digest of a file's content, or None if the file cannot be read."""
+        import hashlib
+        digest = hashlib.sha1()
+        try:
+            with open(filePath, 'rb') as f:
+                while True:
+                    chunk = f.read(self.CHUNK_SIZE)
+                    if not chunk:
+                        break
+
+                    digest.update(chunk)
+        except:
+            return None
+
+        return digest.hexdigest()
+
+    def _target_stats(self, targetPaths):
+        """Return a dictionary with size and modification time of each target file.
+
+        A missing file is represented by None.
+        """
+        stats = {}
+        for targetPath in targetPaths:
+            try:
+                stat = os.stat(targetPath)
+                stats[targetPath] = [stat.st_size, stat.st_mtime_ns]
+            except OSError:
+                stats[targetPath] = None
+        return stats
@@ -0,0 +1,143 @@
+"""Provide a class for Scapple text color classification.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/scappex
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+
+
+class ScapColorClassifier:
+    """Classifier assigning Scapple text colors to categories.
+
+    Public methods:
+        classify(colorStr) -- Return the category of a text color.
+        classify_all(colorStrs) -- Return the categories of a list of text colors.
+        str_to_rgb(colorStr) -- Return a RGB tuple of floats for a given string.
+        parse_color_tags(colorTags) -- Return a list of palette entries for tags.
+
+    Public class constants:
+        MAJOR_CHARA, MINOR_CHARA, LOCATION, ITEM -- categories of the default palette.
+        TAG -- first item of the (TAG, tag name) categories of user-defined colors.
+        TOLERANCE -- maximum deviation of a color component.
+
+    A color belongs to the nearest palette entry, measured by the largest
+    deviation of a color component, if it is within the tolerance.
+    Of several palette entries at the same distance, the first one wins.
+
+    The palette is parsed once on instantiation.
+    The category found for a color string is memoized,
+    so each distinct color is compared with the palette only once.
+    For large numbers of colors and palette entries, classify_all() compares 
+    all colors with the whole palette in a single vectorized step, if NumPy 
+    is installed. Otherwise, the colors are classified one by one.
+    """
+    MAJOR_CHARA = 'majorChara'
+    MINOR_CHARA = 'minorChara'
+    LOCATION = 'location'
+    ITEM = 'item'
+    TAG = 'tag'
+    TOLERANCE = 0.1
+    VECTORIZE_MIN = 4096
+    # Minimum number of color comparisons that pays off importing NumPy.
+
+    def __init__(self, palette):
+        """Parse the palette.
+
+        Positional arguments:
+            palette -- list of (category, color string) tuples in order of precedence.
+        """
+        self._palette = [(category, self.str_to_rgb(colorStr)) for category, colorStr in palette]
+        self._categories = {}
+        # key: color string, value: category or None.
+
+    def classify(self, colorStr):
+        """Return the category of a text color.
+
+        Positional arguments:
+            colorStr -- str: RGB components in a single string.
+
+        Return the category of the nearest palette entry within the tolerance,
+        or None if no palette entry is close.
+        """
+        try:
+            return self._categories[colorStr]
+
+        except KeyError:
+            color = self.str_to_rgb(colorStr)
+            category = None
+            bestDistance = None
+            for paletteCategory, paletteColor in self._palette:
+                distance = max(abs(color[i] - paletteColor[i]) for i in range(3))
+                if distance <= self.TOLERANCE and (bestDistance is None or distance < bestDistance):
+                    category = paletteCategory
+                    bestDistance = distance
+            self._categories[colorStr] = category
+            return category
+
+    def classify_all(self, colorStrs):
+        """Return the categories of a list of text colors.
+
+        Positional arguments:
+            colorStrs -- list of str: RGB components in a single string each.
+
+        Return a list with the category of each color, or None if no palette entry is close.
+        """
+        np = None
+        if len(colorStrs) * len(self._palette) >= self.VECTORIZE_MIN:
+            try:
+                import numpy as np
+            except ImportError:
+                pass
+        if np is None:
+            return [self.classify(colorStr) for colorStr in colorStrs]
+
+        colors = np.array([self.str_to_rgb(colorStr) for colorStr in colorStrs])
+        paletteColors = np.array([paletteColor for __, paletteColor in self._palette])
+        distances = np.abs(colors[:, np.newaxis, :] - paletteColors[np.newaxis, :, :]).max(axis=2)
+        # N x M matrix of the largest component deviations.
+        distances[distances > self.TOLERANCE] = np.inf
+        nearest = distances.argmin(axis=1)
+        isClose = np.isfinite(distances[np.arange(len(colorStrs)), nearest])
+        categories = []
+        for colorStr, i, close in zip(colorStrs, nearest.tolist(), isClose.tolist()):
+            if close:
+                category = self._palette[i][0]
+            else:
+                category = None
+            self._categories[colorStr] = category
+            categories.append(category)
+        return categories
+
+    @staticmethod
+    def str_to_rgb(colorStr):
+        """Return a RGB tuple of floats for a given string."""
+        try:
+            red, green, blue = colorStr.split(' ')
+            return float(red), float(green), float(blue)
+        except(ValueError, AttributeError):
+            return (0.0, 0.0, 0.0)
+
+    @classmethod
+    def parse_color_tags(cls, colorTags):
+        """Return a list of palette entries for tags.
+
+        Positional arguments:
+            colorTags -- str: "tag name:RGB components" entries, separated by semicolons,
+                         e.g. "Subplot A:1.0 0.5 0.0;Faction B:0.0 0.5 0.5".
+
+        Return a list of ((TAG, tag name), color string) tuples. Malformed entries are skipped.
+        """
+        palette = []
+        if colorTags:
+            for entry in colorTags.split(';'):
+                tagName, __, colorStr = entry.rpartition(':')
+                tagName = tagName.strip()
+                components = colorStr.split()
+                try:
+                    [float(component) for component in components]
+                except ValueError:
+                    continue
+
+                if tagName and len(components) == 3:
+                    palette.append(((cls.TAG, tagName), ' '.join(components)))
+        return palette
@@ -0,0 +1,57 @@
+"""Provide a class for the configuration of a Scapple file conversion.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/scappex
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+from pywriter.config.configuration import Configuration
+
+
+class ScapConfiguration(Configuration):
+    """Configuration read from the global INI file and the INI file next to the Scapple file.
+
+    Public methods:
+        get_kwargs(sourcePath, suffix) -- Return the keyword arguments for the conversion of sourcePath.
+    """
+
+    def __init__(self, appName, settings, options, installDir='.'):
+        """Store the defaults and the INI file locations.
+
+        Positional arguments:
+            appName -- str: application name; determines the INI file name.
+            settings -- dict: default settings.
+            options -- dict: default options.
+
+        Optional arguments:
+            installDir -- str: path to the global configuration directory.
+
+        Extends the superclass constructor.
+        """
+        super().__init__(settings, options)
+        self._defaults = (settings, options)
+        self._iniFileName = f'{appName}.ini'
+        self._installDir = installDir
+
+    def get_kwargs(self, sourcePath, suffix=''):
+        """Return the keyword arguments for the conversion of sourcePath.
+
+        Positional arguments:
+            sourcePath -- str: path of the Scapple file.
+
+        Optional arguments:
+            suffix -- str: file name suffix passed to the converter.
+
+        Start from the defaults, so one instance can be used for several Scapple files.
+        The INI file in the Scapple file's directory overrides the global one.
+        """
+        self.set(*self._defaults)
+        sourceDir = os.path.dirname(sourcePath)
+        if not sourceDir:
+            sourceDir = '.'
+        for iniDir in (self._installDir, sourceDir):
+            self.read(f'{iniDir}/{self._iniFileName}')
+        kwargs = {'suffix': suffix}
+        kwargs.update(self.settings)
+        kwargs.update(self.options)
+        return kwargs
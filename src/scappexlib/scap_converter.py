@@ -10,6 +10,7 @@ from pywriter.converter.yw_cnv_ui import YwCnvUi
 from pywriter.yw.yw7_file import Yw7File
 from pywriter.yw.data_files import DataFiles
 from scappexlib.scap_file import ScapFile
+from scappexlib.scap_cache import ScapCache
 
 
 class ScapConverter(YwCnvUi):
@@ -18,6 +19,17 @@ class ScapConverter(YwCnvUi):
     Public methods:
         run(sourcePath, **kwargs) -- Create source and target objects and run conversion.
     """
+
+    def __init__(self):
+        """Define instance variables.
+
+        Extends the superclass constructor.
+        """
+        super().__init__()
+        self._cache = None
+        self._targetPaths = None
+        # Cache and paths of the files generated in the current run, if the cache is used.
+
     def run(self, sourcePath, **kwargs):
         """Create source and target objects and run conversion.
 
@@ -26,8 +38,13 @@ class ScapConverter(YwCnvUi):
         
         Required keyword arguments: 
             (none)
+
+        Optional keyword arguments:
+            use_cache -- bool: if True, keep a cache file next to the Scapple file,
+                         and skip the conversion if nothing has changed since the last run.
         """
         self.newFile = None
+        self._cache = None
 
         if not os.path.isfile(sourcePath):
             self.ui.set_info_how(f'{ERROR}File "{os.path.normpath(sourcePath)}" not found.')
@@ -37,9 +54,34 @@ class ScapConverter(YwCnvUi):
             sourceFile = ScapFile(sourcePath, **kwargs)
             if os.path.isfile(f'{fileName}{Yw7File.EXTENSION}'):
                 targetFile = DataFiles(f'{fileName}{DataFiles.EXTENSION}', **kwargs)
-                self.import_to_yw(sourceFile, targetFile)
+                self._targetPaths = [f'{fileName}_Characters.xml', f'{fileName}_Locations.xml', f'{fileName}_Items.xml']
             else:
                 targetFile = Yw7File(f'{fileName}{Yw7File.EXTENSION}', **kwargs)
+                self._targetPaths = [targetFile.filePath]
+            if kwargs.get('use_cache', False):
+                # The generated files depend only on the Scapple file and the configuration.
+                self._cache = ScapCache(sourcePath, kwargs)
+                if self._cache.is_unchanged(self._targetPaths):
+                    self.ui.set_info_how(f'No changes: "{os.path.normpath(sourcePath)}".')
+                    self.newFile = targetFile.filePath
+                    return
+
+            if isinstance(targetFile, DataFiles):
+                self.import_to_yw(sourceFile, targetFile)
+            else:
                 self.create_yw7(sourceFile, targetFile)
+            if self._cache is not None and self.newFile is not None:
+                self._cache.save(self._targetPaths)
         else:
             self.ui.set_info_how(f'{ERROR}File type of "{os.path.normpath(sourcePath)}" not supported.')
+
+    def _is_up_to_date(self, source, target):
+        """Return True if the notes and the generated files have not changed since the last run.
+
+        Positional arguments:
+            source -- ScapFile instance; it has been read.
+            target -- Yw7File or DataFiles instance.
+
+        Overrides the superclass method.
+        """
+        return self._cache is not None and self._cache.is_unchanged(self._targetPaths, source.fingerprints)
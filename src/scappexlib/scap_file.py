@@ -5,7 +5,6 @@ For further information see https://github.com/peter88213/aeon2yw
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import os
-import xml.etree.ElementTree as ET
 from pywriter.pywriter_globals import ERROR
 from pywriter.yw.yw7_file import Yw7File
 from pywriter.model.chapter import Chapter
@@ -13,6 +12,12 @@ from pywriter.model.scene import Scene
 from pywriter.model.character import Character
 from pywriter.model.world_element import WorldElement
 from scappexlib.scap_note import ScapNote
+from scappexlib.scap_note_table import ScapNoteTable
+from scappexlib.scap_shape import ScapShape
+from scappexlib.scap_shape_index import ScapShapeIndex
+from scappexlib.scap_color import ScapColorClassifier
+from scappexlib.scap_reader import ScapReader
+from scappexlib.scap_graph import ScapGraph
 
 
 class ScapFile(Yw7File):
@@ -21,16 +26,28 @@ class ScapFile(Yw7File):
     Represents a scap file containing an outline according to the conventions.
     - Scenes are shadowed.
     - Characters/locations/items are textColor-coded.
+
+    Public instance variables:
+        fingerprints -- list of int: checksums of the notes and background shapes read,
+                        if the use_cache option is set; otherwise None.
     """
     EXTENSION = '.scap'
     DESCRIPTION = 'Scapple diagram'
     SUFFIX = ''
 
+    _SCENE = 1
+    _CHARACTER = 2
+    _LOCATION = 3
+    _ITEM = 4
+    _TAG = 5
+    _NOTE = 6
+    # Kinds of notes, used for resolving the connections.
+
     # Events assigned to the "narrative arc" (case insensitive) become
     # regular scenes, the others become Notes scenes.
 
     def __init__(self, filePath, **kwargs):
-        """Initialize instance variables and ScapNote class variables.
+        """Initialize instance variables and the color classifier.
 
         Positional arguments:
             filePath -- str: path to the file represented by the Novel instance.
@@ -44,134 +61,303 @@ class ScapFile(Yw7File):
             export_characters -- bool: if True, create characters from Scapple notes.
             export_locations -- bool: if True, create location from Scapple notes. 
             export_items -- bool: if True, create items from Scapple notes. 
+
+        Optional keyword arguments:
+            color_tags -- str: "tag name:RGB text color" entries, separated by semicolons. 
+                          Scenes with one of these text colors get the tag.
+            scene_row_tolerance -- str: maximum vertical offset of scenes in the same row.
+            chapter_layout -- str: "rows" or "columns" to create a chapter from each row or column of scenes,
+                              "shapes" to create chapters and parts from the background shapes;
+                              otherwise, all scenes are assigned to a single chapter.
+            chapter_gap -- str: minimum distance between two rows or columns of scenes.
+            use_cache -- bool: if True, compute the fingerprints while reading.
         
         Extends the superclass constructor.
         """
-        ScapNote.locationColor = kwargs['location_color']
-        ScapNote.itemColor = kwargs['item_color']
-        ScapNote.majorCharaColor = kwargs['major_chara_color']
-        ScapNote.minorCharaColor = kwargs['minor_chara_color']
+        self._colorClassifier = ScapColorClassifier([
+            (ScapColorClassifier.MAJOR_CHARA, kwargs['major_chara_color']),
+            (ScapColorClassifier.MINOR_CHARA, kwargs['minor_chara_color']),
+            (ScapColorClassifier.LOCATION, kwargs['location_color']),
+            (ScapColorClassifier.ITEM, kwargs['item_color']),
+            ] + ScapColorClassifier.parse_color_tags(kwargs.get('color_tags', '')))
         super().__init__(filePath, **kwargs)
         self._exportScenes = kwargs['export_scenes']
         self._exportCharacters = kwargs['export_characters']
         self._exportLocations = kwargs['export_locations']
         self._exportItems = kwargs['export_items']
+        try:
+            self._rowTolerance = float(kwargs.get('scene_row_tolerance', 0))
+        except ValueError:
+            self._rowTolerance = 0.0
+        self._chapterLayout = kwargs.get('chapter_layout', '').strip().lower()
+        try:
+            self._chapterGap = float(kwargs.get('chapter_gap', 50))
+        except ValueError:
+            self._chapterGap = 50.0
+        self._shapes = []
+        # List of ScapShape instances.
+
+        self.fingerprints = None
+        self._useFingerprints = kwargs.get('use_cache', False)
 
     def read(self):
         """Parse the Scapple xml file, fetching the Novel attributes.
         
         Create an object structure of Scapple notes.
+        The file is parsed incrementally; each note is processed and
+        discarded as soon as it is complete.
         Return a message beginning with the ERROR constant in case of error.
         Overrides the superclass method.
         """
         try:
-            self._tree = ET.parse(self.filePath)
+            table = self._parse_notes()
         except:
             return f'{ERROR}Can not process "{os.path.normpath(self.filePath)}".'
-        root = self._tree.getroot()
-
-        #--- Create a single chapter and assign all scenes to it.
-        chId = '1'
-        self.chapters[chId] = Chapter()
-        self.chapters[chId].title = 'Chapter 1'
-        self.srtChapters = [chId]
-
-        #--- Parse Scapple notes.
-        scapNotes = {}
-        uidByPos = {}
-        for xmlNote in root.iter('Note'):
-            note = ScapNote()
+
+        self._create_elements(table)
+        self._create_chapters(table)
+        self._resolve_relationships(table)
+        return 'Scapple data converted to novel structure.'
+
+    def _parse_notes(self):
+        """Parse the Scapple notes and return them as a table.
+        
+        Return a ScapNoteTable instance with a row for each note.
+        With the "shapes" chapter layout, the background shapes are kept in self._shapes;
+        shapes of unknown geometry are ignored.
+        Raise OSError or xml.etree.ElementTree.ParseError in case of error.
+        """
+        table = ScapNoteTable()
+        reader = ScapReader(readShapes=self._chapterLayout == 'shapes')
+        note = ScapNote()
+        fingerprints = None
+        if self._useFingerprints:
+            fingerprints = []
+        for xmlNote in reader.iter_notes(self.filePath):
             note.parse_xml(xmlNote)
-            scapNotes[note.uid] = note
-            uidByPos[note.position] = note.uid
-
-            # Create Novel elements.
-            if note.isScene:
-                if self._exportScenes:
-                    scene = Scene()
-                    scene.title = note.text
-                    scene.isNotesScene = note.isNotesScene
-                    scene.status = 1
-                    # Status = Outline
-                    self.scenes[note.uid] = scene
-            elif note.isMajorChara:
-                if self._exportCharacters:
-                    character = Character()
-                    character.title = note.text
-                    character.fullName = note.text
-                    character.isMajor = True
-                    self.characters[note.uid] = character
-                    self.srtCharacters.append(note.uid)
-            elif note.isMinorChara:
-                if self._exportCharacters:
-                    character = Character()
-                    character.title = note.text
-                    character.fullName = note.text
-                    character.isMajor = False
-                    self.characters[note.uid] = character
-                    self.srtCharacters.append(note.uid)
-            elif note.isLocation:
-                if self._exportLocations:
-                    location = WorldElement()
-                    location.title = note.text
-                    self.locations[note.uid] = location
-                    self.srtLocations.append(note.uid)
-            elif note.isItem:
-                if self._exportItems:
-                    item = WorldElement()
-                    item.title = note.text
-                    self.items[note.uid] = item
-                    self.srtItems.append(note.uid)
-
-        #--- Sort notes by position.
-        srtNotes = sorted(uidByPos.items())
-        for srtNote in srtNotes:
-            if srtNote[1] in self.scenes:
-                self.chapters[chId].srtScenes.append(srtNote[1])
-
-        #--- Assign characters/locations/items/tags/notes to the scenes.
+            xmlNote.clear()
+            table.append(note)
+            if fingerprints is not None:
+                fingerprints.append(note.fingerprint())
+        self._shapes = []
+        for xmlShape in reader.shapes:
+            shape = ScapShape()
+            try:
+                shape.parse_xml(xmlShape)
+            except (KeyError, ValueError):
+                continue
+
+            self._shapes.append(shape)
+            if fingerprints is not None:
+                fingerprints.append(shape.fingerprint())
+        self.fingerprints = fingerprints
+        return table
+
+    def _create_elements(self, table):
+        """Create scenes, characters, locations, and items from the classified notes.
+        
+        Positional arguments:
+            table -- ScapNoteTable instance.
+        """
+        table.classify(self._colorClassifier)
+        uids = table.uids
+        flags = table.flags
+        if self._exportScenes:
+            for row in table.rows_with(table.SCENE):
+                scene = Scene()
+                scene.title = table.text(row)
+                scene.isNotesScene = bool(flags[row] & table.NOTES_SCENE)
+                scene.status = 1
+                # Status = Outline
+                self.scenes[str(uids[row])] = scene
+        if self._exportCharacters:
+            for row in table.rows_with(table.MAJOR_CHARA | table.MINOR_CHARA):
+                character = Character()
+                character.title = table.text(row)
+                character.fullName = table.text(row)
+                character.isMajor = bool(flags[row] & table.MAJOR_CHARA)
+                crId = str(uids[row])
+                self.characters[crId] = character
+                self.srtCharacters.append(crId)
+        for export, flag, elements, srtElements in (
+                (self._exportLocations, table.LOCATION, self.locations, self.srtLocations),
+                (self._exportItems, table.ITEM, self.items, self.srtItems),
+                ):
+            if export:
+                for row in table.rows_with(flag):
+                    element = WorldElement()
+                    element.title = table.text(row)
+                    elemId = str(uids[row])
+                    elements[elemId] = element
+                    srtElements.append(elemId)
+
+    def _create_chapters(self, table):
+        """Create the chapters and assign the scenes to them, sorted by position.
+        
+        Positional arguments:
+            table -- ScapNoteTable instance.
+
+        Depending on the chapter layout, each row or column of scenes
+        becomes a chapter, each background shape becomes a chapter or part,
+        or all scenes are assigned to a single chapter.
+        """
+        sceneRows = []
+        if self._exportScenes:
+            sceneRows = list(table.rows_with(table.SCENE))
+        if self._chapterLayout == 'shapes':
+            outline = self._outline_shapes(table, sceneRows)
+        elif self._chapterLayout in ('rows', 'columns'):
+            outline = [(None, None, line) for line in
+                       table.group_by_layout(sceneRows, self._chapterGap, self._chapterLayout == 'columns')]
+        else:
+            outline = [(None, None, table.sort_by_position(sceneRows, self._rowTolerance))]
+        for i, (title, chLevel, rows) in enumerate(outline or [(None, None, [])], 1):
+            chId = str(i)
+            self.chapters[chId] = Chapter()
+            if title:
+                self.chapters[chId].title = title
+            elif chLevel == 1:
+                self.chapters[chId].title = f'Part {i}'
+            else:
+                self.chapters[chId].title = f'Chapter {i}'
+            self.chapters[chId].chLevel = chLevel
+            self.chapters[chId].srtScenes = [str(table.uids[row]) for row in rows]
+            self.srtChapters.append(chId)
+
+    def _outline_shapes(self, table, sceneRows):
+        """Return a list of (title, chapter level, rows) tuples, one for each background shape.
+        
+        Positional arguments:
+            table -- ScapNoteTable instance.
+            sceneRows -- list of the scene rows.
+
+        Shapes enclosing other shapes become parts, the others become chapters. 
+        Each scene is assigned to the innermost shape it is placed in.
+        A shape is titled by the topmost plain note placed in it, i.e. a note
+        that is neither a scene, a tag, a note, nor color-coded.
+        Scenes outside any shape are assigned to an extra chapter at the end.
+        """
+        index = ScapShapeIndex(self._shapes)
+        shapeRows = [[] for __ in self._shapes]
+        outsideRows = []
+        for row in table.sort_by_position(sceneRows, self._rowTolerance):
+            i = index.find(table.xs[row], table.ys[row])
+            if i is None:
+                outsideRows.append(row)
+            else:
+                shapeRows[i].append(row)
+        titles = [None] * len(self._shapes)
+        kinds = (table.SCENE | table.TAG | table.NOTE | table.MAJOR_CHARA | table.MINOR_CHARA
+                 | table.LOCATION | table.ITEM)
+        plainRows = [row for row, flags in enumerate(table.flags) if not flags & kinds]
+        for row in table.sort_by_position(plainRows):
+            i = index.find(table.xs[row], table.ys[row])
+            if i is not None and titles[i] is None:
+                titles[i] = table.text(row)
+        outline = []
+        for i, __ in index.iter_outline():
+            if index.children[i]:
+                chLevel = 1
+            else:
+                chLevel = 0
+            outline.append((titles[i], chLevel, shapeRows[i]))
+        if outsideRows or not outline:
+            outline.append((None, 0, outsideRows))
+        return outline
+
+    def _resolve_relationships(self, table):
+        """Assign the Novel elements and notes to each other according to the connections.
+        
+        Positional arguments:
+            table -- ScapNoteTable instance.
+        """
+        #--- Assign characters/locations/items/tags/notes to the scenes,
+        #    and tags/notes to the characters/locations/items.
+        # All connections are resolved in a single pass over the board's graph.
+        kinds = {}
+        # key: int UID, value: kind of the Novel element or note.
+        for scId in self.scenes:
+            kinds[int(scId)] = self._SCENE
+        for crId in self.characters:
+            kinds[int(crId)] = self._CHARACTER
+        for lcId in self.locations:
+            kinds[int(lcId)] = self._LOCATION
+        for itId in self.items:
+            kinds[int(itId)] = self._ITEM
+        texts = {}
+        # key: int UID, value: text of a tag or note.
+        for row in table.rows_with(table.TAG | table.NOTE):
+            uid = table.uids[row]
+            if table.flags[row] & table.TAG:
+                kinds[uid] = self._TAG
+            else:
+                kinds[uid] = self._NOTE
+            texts[uid] = table.text(row)
+
+        viewpoints = {}
+        # key: scene ID, value: list of IDs of the characters pointing to the scene.
+        notes = {}
+        # key: element ID, value: list of note texts.
+        for element in (self.scenes, self.characters, self.locations, self.items):
+            for elemId in element:
+                element[elemId].tags = []
+        for row in table.rows_with(table.SCENE):
+            # Color-coded scenes get the tag of their color first.
+            category = table.category(row)
+            scId = str(table.uids[row])
+            if isinstance(category, tuple) and scId in self.scenes:
+                self.scenes[scId].tags.append(category[1])
         for scId in self.scenes:
             self.scenes[scId].characters = []
             self.scenes[scId].locations = []
             self.scenes[scId].items = []
-            self.scenes[scId].tags = []
-            self.scenes[scId].sceneNotes = ''
-            for uid in scapNotes[scId].connections:
-                if uid in self.characters:
-                    if scId in scapNotes[uid].pointTo:
-                        self.scenes[scId].characters.insert(0, uid)
-                    else:
-                        self.scenes[scId].characters.append(uid)
-                elif uid in self.locations:
-                    self.scenes[scId].locations.append(uid)
-                elif uid in self.items:
-                    self.scenes[scId].items.append(uid)
-                elif scapNotes[uid].isTag:
-                    self.scenes[scId].tags.append(scapNotes[uid].text)
-                elif scapNotes[uid].isNote:
-                    self.scenes[scId].sceneNotes = f'{self.scenes[scId].sceneNotes}{scapNotes[uid].text}'
-
-        #--- Assign tags/notes to the characters.
+            viewpoints[scId] = []
+            notes[scId] = []
         for crId in self.characters:
-            self.characters[crId].tags = []
-            self.characters[crId].notes = ''
-            for uid in scapNotes[crId].connections:
-                if scapNotes[uid].isTag:
-                    self.characters[crId].tags.append(scapNotes[uid].text)
-                elif scapNotes[uid].isNote:
-                    self.characters[crId].notes = f'{self.characters[crId].notes}{scapNotes[uid].text}'
-
-        #--- Assign tags to the locations.
-        for lcId in self.locations:
-            self.locations[lcId].tags = []
-            for uid in scapNotes[lcId].connections:
-                if scapNotes[uid].isTag:
-                    self.locations[lcId].tags.append(scapNotes[uid].text)
+            notes[crId] = []
 
-        #--- Assign tags to the items.
-        for itId in self.items:
-            self.items[itId].tags = []
-            for uid in scapNotes[itId].connections:
-                if scapNotes[uid].isTag:
-                    self.items[itId].tags.append(scapNotes[uid].text)
-        return 'Scapple data converted to novel structure.'
+        graph = ScapGraph(table)
+        for source, target in graph.edges():
+            sourceKind = kinds.get(source)
+            if sourceKind is None:
+                continue
+
+            targetKind = kinds.get(target)
+            if targetKind is None:
+                continue
+
+            if sourceKind == self._SCENE:
+                scId = str(source)
+                if targetKind == self._CHARACTER:
+                    if graph.points_to(target, source):
+                        viewpoints[scId].append(str(target))
+                    else:
+                        self.scenes[scId].characters.append(str(target))
+                elif targetKind == self._LOCATION:
+                    self.scenes[scId].locations.append(str(target))
+                elif targetKind == self._ITEM:
+                    self.scenes[scId].items.append(str(target))
+                elif targetKind == self._TAG:
+                    self.scenes[scId].tags.append(texts[target])
+                elif targetKind == self._NOTE:
+                    notes[scId].append(texts[target])
+            elif sourceKind == self._CHARACTER:
+                crId = str(source)
+                if targetKind == self._TAG:
+                    self.characters[crId].tags.append(texts[target])
+                elif targetKind == self._NOTE:
+                    notes[crId].append(texts[target])
+            elif sourceKind == self._LOCATION:
+                if targetKind == self._TAG:
+                    self.locations[str(source)].tags.append(texts[target])
+            elif sourceKind == self._ITEM:
+                if targetKind == self._TAG:
+                    self.items[str(source)].tags.append(texts[target])
+
+        for scId in self.scenes:
+            # Viewpoint characters go first, the last one found at the top.
+            viewpoints[scId].reverse()
+            self.scenes[scId].characters = viewpoints[scId] + self.scenes[scId].characters
+            self.scenes[scId].sceneNotes = ''.join(text for text in notes[scId] if text is not None)
+        for crId in self.characters:
+            self.characters[crId].notes = ''.join(text for text in notes[crId] if text is not None)
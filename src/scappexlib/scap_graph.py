@@ -0,0 +1,84 @@
+"""Provide a class for the connection graph of a Scapple board.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/scappex
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from array import array
+
+
+class ScapGraph:
+    """Adjacency index of the note connections, built once per board.
+
+    Public methods:
+        edges() -- Iterate over all (source, target) connections.
+        neighbors(uid) -- Return the UIDs connected to a note.
+        points_to(source, target) -- Return True if there is an arrow from source to target.
+
+    Public instance variables:
+        uids -- array of int: the note UIDs in ascending order.
+
+    The undirected connections are stored in compressed sparse row (CSR) form:
+    the neighbors of uids[i] are targets[offsets[i]:offsets[i + 1]], in ascending order.
+    The arrows are stored as a set of encoded (source, target) pairs.
+    """
+
+    def __init__(self, table):
+        """Build the index.
+
+        Positional arguments:
+            table -- ScapNoteTable instance.
+        """
+        self.uids = array('I')
+        self._offsets = array('I', [0])
+        self._targets = array('I')
+        self._rows = {}
+        # key: int UID, value: row index in uids/offsets.
+
+        self._arrows = set()
+        for row in sorted(range(len(table)), key=table.uids.__getitem__):
+            uid = table.uids[row]
+            self._rows[uid] = len(self.uids)
+            self.uids.append(uid)
+            self._targets.extend(table.iter_connections(row))
+            self._offsets.append(len(self._targets))
+            for target in table.iter_points_to(row):
+                self._arrows.add(self._arrow_key(uid, target))
+
+    def edges(self):
+        """Iterate over all (source, target) connections.
+
+        Each connection is yielded once per direction,
+        grouped by source in ascending order.
+        """
+        targets = self._targets
+        offsets = self._offsets
+        for i, uid in enumerate(self.uids):
+            for j in range(offsets[i], offsets[i + 1]):
+                yield uid, targets[j]
+
+    def neighbors(self, uid):
+        """Return the UIDs connected to a note, in ascending order.
+
+        Positional arguments:
+            uid -- int: note UID.
+        """
+        try:
+            i = self._rows[uid]
+        except KeyError:
+            return self._targets[0:0]
+
+        return self._targets[self._offsets[i]:self._offsets[i + 1]]
+
+    def points_to(self, source, target):
+        """Return True if there is an arrow from source to target.
+
+        Positional arguments:
+            source, target -- int: note UIDs.
+        """
+        return self._arrow_key(source, target) in self._arrows
+
+    @staticmethod
+    def _arrow_key(source, target):
+        """Return a single int encoding an arrow."""
+        return (source << 32) | target
@@ -0,0 +1,77 @@
+"""Provide a class for compact Scapple note ID lists.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/scappex
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from array import array
+from bisect import bisect_right
+
+
+class ScapIdRanges:
+    """Set of note UIDs, stored as sorted ranges.
+
+    Scapple writes note ID lists such as "0-40000, 40002".
+    Instead of expanding them, the ranges are kept in an array of
+    boundaries [start0, stop0, start1, stop1, ...], where each range
+    includes start and excludes stop.
+
+    The UIDs are Scapple IDs incremented by 1, as in ScapNote.uid.
+
+    Supported operations:
+        uid in ranges -- O(log n) membership test for int or str UIDs.
+        iter(ranges) -- lazy iteration over the int UIDs in ascending order.
+        len(ranges) -- number of UIDs.
+        iter_ranges() -- iteration over the (start, stop) tuples.
+    """
+
+    def __init__(self, idList=None):
+        """Parse a Scapple ID list.
+
+        Optional arguments:
+            idList -- str: comma-separated Scapple IDs and ID ranges, e.g. "1-2, 4-5, 12".
+        """
+        ranges = []
+        if idList:
+            for group in idList.split(','):
+                group = group.strip()
+                if not group:
+                    continue
+
+                if '-' in group:
+                    first, last = group.split('-')
+                    ranges.append((int(first) + 1, int(last) + 2))
+                else:
+                    uid = int(group) + 1
+                    ranges.append((uid, uid + 1))
+        ranges.sort()
+        self._bounds = array('I')
+        for start, stop in ranges:
+            if self._bounds and start <= self._bounds[-1]:
+                # Overlapping or adjacent: extend the previous range.
+                if stop > self._bounds[-1]:
+                    self._bounds[-1] = stop
+            else:
+                self._bounds.append(start)
+                self._bounds.append(stop)
+
+    def __contains__(self, uid):
+        return bisect_right(self._bounds, int(uid)) % 2 == 1
+
+    def __iter__(self):
+        for i in range(0, len(self._bounds), 2):
+            yield from range(self._bounds[i], self._bounds[i + 1])
+
+    def __len__(self):
+        count = 0
+        for i in range(0, len(self._bounds), 2):
+            count += self._bounds[i + 1] - self._bounds[i]
+        return count
+
+    def __bool__(self):
+        return len(self._bounds) > 0
+
+    def iter_ranges(self):
+        """Iterate over the (start, stop) tuples of the ranges."""
+        for i in range(0, len(self._bounds), 2):
+            yield self._bounds[i], self._bounds[i + 1]
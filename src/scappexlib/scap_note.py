@@ -4,6 +4,8 @@ Copyright (c) 2022 Peter Triesberger
 For further information see https://github.com/peter88213/scappex
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
+import zlib
+from scappexlib.scap_id_ranges import ScapIdRanges
 
 
 class ScapNote:
@@ -11,6 +13,7 @@ class ScapNote:
     
     Public methods:
         parse_xml -- parse a single Scapple note.
+        fingerprint() -- Return a checksum of the parsed note.
     
     Public instance variables:
         text -- str: note text.
@@ -19,18 +22,17 @@ class ScapNote:
         isTag -- bool: True, if the note represents a yWriter tag.
         isNote -- bool: True, if the note represents a yWriter note.
         textColor -- str: text color; RGB components in a single string.
-        connections -- list of connected note IDs.
-        pointTo -- list of note IDs pointed to.
-        position -- float: combined x/y position.
+        connections -- ScapIdRanges: connected note UIDs.
+        pointTo -- ScapIdRanges: UIDs of the notes pointed to.
+        x, y -- float: position on the board.
         uid -- str: Scapple UID, incremented by 1.
+
+    Notes that are neither scenes nor tags nor notes may be color-coded;
+    they are classified by their text color later on (see ScapNoteTable.classify).
     """
-    Y_FACTOR = 100000
-    # Sortable position = y * Y_FACTOR + x
-    # This works if x and y are not greater than 9999.9
-    locationColor = None
-    itemColor = None
-    majorCharaColor = None
-    minorCharaColor = None
+    __slots__ = ('text', 'isScene', 'isNotesScene', 'isTag', 'isNote', 'textColor', 'connections', 'pointTo',
+                 'x', 'y', 'uid')
+    # One instance is reused for parsing all notes of a board, which are stored in a ScapNoteTable.
 
     def __init__(self):
         self.text = None
@@ -38,14 +40,11 @@ class ScapNote:
         self.isNotesScene = None
         self.isTag = None
         self.isNote = None
-        self.isMajorChara = None
-        self.isMinorChara = None
-        self.isLocation = None
-        self.isItem = None
         self.textColor = None
         self.connections = None
         self.pointTo = None
-        self.position = None
+        self.x = None
+        self.y = None
         self.uid = None
 
     def parse_xml(self, xmlNote):
@@ -57,38 +56,15 @@ class ScapNote:
         Write instance variables:
         isScene, isTag, isNote, textColor, connections, pointTo
         """
-
-        def str_to_rgb(colorStr):
-            """Return a RGB tuple of floats for a given string."""
-            try:
-                red, green, blue = colorStr.split(' ')
-                return float(red), float(green), float(blue)
-            except(ValueError):
-                return (0.0, 0.0, 0.0)
-
-        def color_matches(color1, color2):
-            """Return True if color1 is close to color2, otherwise return False."""
-            TOLERANCE = 0.1
-            c1 = str_to_rgb(color1)
-            c2 = str_to_rgb(color2)
-            for i in range(3):
-                if abs(c1[i] - c2[i]) > TOLERANCE:
-                    return False
-
-            return True
-
         self.isScene = False
         self.isNotesScene = False
         self.isTag = False
         self.isNote = False
-        self.isMajorChara = False
-        self.isMinorChara = False
-        self.isLocation = False
-        self.isItem = False
         self.textColor = ''
         self.text = xmlNote.find('String').text
         positionStr = xmlNote.attrib['Position'].split(',')
-        self.position = float(positionStr[1]) * self.Y_FACTOR + float(positionStr[0])
+        self.x = float(positionStr[0])
+        self.y = float(positionStr[1])
 
         # Set UID.
         # Because Scapple UIDs begin with zero, they are all incremented by 1 for yWriter use.
@@ -111,41 +87,18 @@ class ScapNote:
             self.isTag = True
         elif borderStyle == 'Cloud':
             self.isNote = True
-        elif color_matches(self.textColor, self.majorCharaColor):
-            self.isMajorChara = True
-        elif color_matches(self.textColor, self.minorCharaColor):
-            self.isMinorChara = True
-        elif color_matches(self.textColor, self.locationColor):
-            self.isLocation = True
-        elif color_matches(self.textColor, self.itemColor):
-            self.isItem = True
 
-        #--- Create a list of connected notes.
-        self.connections = []
-        if xmlNote.find('ConnectedNoteIDs') is not None:
-            connGroups = xmlNote.find('ConnectedNoteIDs').text.split(', ')
-            for connText in connGroups:
-                if '-' in connText:
-                    conns = connText.split('-')
-                    start = int(conns[0]) + 1
-                    end = int(conns[1]) + 2
-                    for i in range(start, end):
-                        self.connections.append(str(i))
-                else:
-                    i = int(connText) + 1
-                    self.connections.append(str(i))
+        #--- Store the connected notes and the notes pointed to as UID ranges.
+        self.connections = ScapIdRanges(xmlNote.findtext('ConnectedNoteIDs'))
+        self.pointTo = ScapIdRanges(xmlNote.findtext('PointsToNoteIDs'))
+
+    def fingerprint(self):
+        """Return a CRC32 checksum of the parsed note as int.
 
-        #--- Create a list of notes pointed to.
-        self.pointTo = []
-        if xmlNote.find('PointsToNoteIDs') is not None:
-            pointGroups = xmlNote.find('PointsToNoteIDs').text.split(', ')
-            for pointText in pointGroups:
-                if '-' in pointText:
-                    points = pointText.split('-')
-                    start = int(points[0]) + 1
-                    end = int(points[1]) + 2
-                    for i in range(start, end):
-                        self.pointTo.append(str(i))
-                else:
-                    i = int(pointText) + 1
-                    self.pointTo.append(str(i))
+        The checksum covers everything the conversion reads from the note:
+        ID, text, appearance, position, and connections.
+        """
+        data = (self.uid, self.text, self.textColor, self.x, self.y,
+                self.isScene, self.isNotesScene, self.isTag, self.isNote,
+                tuple(self.connections.iter_ranges()), tuple(self.pointTo.iter_ranges()))
+        return zlib.crc32(repr(data).encode('utf-8'))
@@ -0,0 +1,267 @@
+"""Provide a class for the column-oriented note table of a Scapple board.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/scappex
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from array import array
+from scappexlib.scap_color import ScapColorClassifier
+
+
+class ScapNoteTable:
+    """Notes of a Scapple board, stored column by column.
+
+    Public methods:
+        append(note) -- Add a parsed note as a new row.
+        classify(classifier) -- Classify the text colors of the notes.
+        category(row) -- Return the color category of a note.
+        rows_with(flags) -- Generate the rows having any of the flags set.
+        text(row) -- Return the text of a note.
+        sort_by_position(rows, rowTolerance) -- Return rows sorted from top left to bottom right.
+        group_by_layout(rows, gap, columns) -- Return rows grouped into rows or columns of notes.
+        iter_connections(row) -- Generate the UIDs connected to a note.
+        iter_points_to(row) -- Generate the UIDs of the notes a note points to.
+
+    Public instance variables:
+        uids -- array of int: note UIDs (Scapple IDs incremented by 1).
+        xs -- array of float: x positions.
+        ys -- array of float: y positions.
+        flags -- array of int: bit field of the note kinds (see the flag constants).
+        colors -- array of int: index of the text color in palette.
+        palette -- list of str: the distinct text colors.
+        categories -- list: color category of each palette entry, or None if not classified.
+
+    Instead of one ScapNote instance per note, each note is a row index into
+    arrays of machine values. The texts are kept in a single string, and
+    the connection ID ranges in a single array of boundaries.
+    """
+    SCENE = 1
+    NOTES_SCENE = 2
+    TAG = 4
+    NOTE = 8
+    MAJOR_CHARA = 16
+    MINOR_CHARA = 32
+    LOCATION = 64
+    ITEM = 128
+    NO_TEXT = 256
+    # Flags; NO_TEXT distinguishes a note without a text element from an empty one.
+
+    _CATEGORY_FLAGS = {
+        ScapColorClassifier.MAJOR_CHARA: MAJOR_CHARA,
+        ScapColorClassifier.MINOR_CHARA: MINOR_CHARA,
+        ScapColorClassifier.LOCATION: LOCATION,
+        ScapColorClassifier.ITEM: ITEM,
+        }
+    # Flags set by color; they apply to notes that are not scenes, tags, or notes.
+
+    def __init__(self):
+        """Initialize instance variables."""
+        self.uids = array('I')
+        self.xs = array('d')
+        self.ys = array('d')
+        self.flags = array('H')
+        self.colors = array('I')
+        self.palette = []
+        self.categories = None
+        self._colorIndex = {}
+        # key: text color, value: index in palette.
+
+        self._text = ''
+        self._textParts = []
+        # Texts appended since the last join.
+
+        self._textOffsets = array('I', [0])
+        # The text of row i is _text[_textOffsets[i]:_textOffsets[i + 1]].
+
+        self._connections = array('I')
+        self._connectionOffsets = array('I', [0])
+        self._pointTo = array('I')
+        self._pointToOffsets = array('I', [0])
+        # Range boundaries [start0, stop0, start1, stop1, ...] of each row,
+        # found at [offsets[i]:offsets[i + 1]], as in ScapIdRanges.
+
+    def __len__(self):
+        return len(self.uids)
+
+    def append(self, note):
+        """Add a parsed note as a new row.
+
+        Positional arguments:
+            note -- ScapNote instance; it can be reused for the next note.
+        """
+        self.uids.append(int(note.uid))
+        self.xs.append(note.x)
+        self.ys.append(note.y)
+        flags = 0
+        for isSet, flag in (
+                (note.isScene, self.SCENE),
+                (note.isNotesScene, self.NOTES_SCENE),
+                (note.isTag, self.TAG),
+                (note.isNote, self.NOTE),
+                ):
+            if isSet:
+                flags |= flag
+        text = note.text
+        if text is None:
+            flags |= self.NO_TEXT
+            text = ''
+        self.flags.append(flags)
+        try:
+            self.colors.append(self._colorIndex[note.textColor])
+        except KeyError:
+            self._colorIndex[note.textColor] = len(self.palette)
+            self.colors.append(len(self.palette))
+            self.palette.append(note.textColor)
+        self._textParts.append(text)
+        self._textOffsets.append(self._textOffsets[-1] + len(text))
+        for ranges, bounds, offsets in (
+                (note.connections, self._connections, self._connectionOffsets),
+                (note.pointTo, self._pointTo, self._pointToOffsets),
+                ):
+            for start, stop in ranges.iter_ranges():
+                bounds.append(start)
+                bounds.append(stop)
+            offsets.append(len(bounds))
+
+    def classify(self, classifier):
+        """Classify the text colors of the notes.
+
+        Positional arguments:
+            classifier -- ScapColorClassifier instance.
+
+        Each distinct color is classified once, and the color-coded notes get
+        the flag of their category. The categories are kept for category().
+        """
+        self.categories = classifier.classify_all(self.palette)
+        paletteFlags = array('H', [self._CATEGORY_FLAGS.get(category, 0) for category in self.categories])
+        shapeFlags = self.SCENE | self.TAG | self.NOTE
+        flags = self.flags
+        colors = self.colors
+        for row in range(len(flags)):
+            if not flags[row] & shapeFlags:
+                flags[row] |= paletteFlags[colors[row]]
+
+    def category(self, row):
+        """Return the color category of a note, or None if it has none.
+
+        Positional arguments:
+            row -- int: row index.
+        """
+        return self.categories[self.colors[row]]
+
+    def rows_with(self, flags):
+        """Generate the rows having any of the flags set, in the order of the board.
+
+        Positional arguments:
+            flags -- int: combination of flag constants.
+        """
+        for row, rowFlags in enumerate(self.flags):
+            if rowFlags & flags:
+                yield row
+
+    def text(self, row):
+        """Return the text of a note, or None if it has no text element.
+
+        Positional arguments:
+            row -- int: row index.
+        """
+        if self.flags[row] & self.NO_TEXT:
+            return None
+
+        if self._textParts:
+            self._text = ''.join([self._text] + self._textParts)
+            self._textParts = []
+        return self._text[self._textOffsets[row]:self._textOffsets[row + 1]]
+
+    def sort_by_position(self, rows, rowTolerance=0.0):
+        """Return a list of rows, sorted by the position of the notes from top left to bottom right.
+
+        Positional arguments:
+            rows -- iterable of int: row indices.
+
+        Optional arguments:
+            rowTolerance -- float: maximum vertical offset of notes in the same row.
+
+        The notes are sorted by their exact (y, x) coordinates. 
+        With a row tolerance, notes placed at most rowTolerance below the
+        topmost note of a row are considered to be in this row, and sorted
+        from left to right. Notes at the same position keep their order.
+        """
+        if rowTolerance <= 0:
+            return sorted(rows, key=lambda row: (self.ys[row], self.xs[row]))
+
+        sortedRows = []
+        for line in self._sweep(rows, self.ys, self.xs, rowTolerance, True):
+            sortedRows.extend(line)
+        return sortedRows
+
+    def group_by_layout(self, rows, gap, columns=False):
+        """Return a list of lists of rows, grouped by the layout of the notes in reading order.
+
+        Positional arguments:
+            rows -- iterable of int: row indices.
+            gap -- float: minimum distance between two groups.
+
+        Optional arguments:
+            columns -- bool: if True, group into columns, otherwise into rows.
+
+        Rows of notes are returned from top to bottom, each sorted from left to right.
+        Columns of notes are returned from left to right, each sorted from top to bottom.
+        A new group begins where the notes are more than gap apart across the groups.
+        """
+        if columns:
+            return self._sweep(rows, self.xs, self.ys, gap, False)
+
+        return self._sweep(rows, self.ys, self.xs, gap, False)
+
+    @staticmethod
+    def _sweep(rows, across, along, maxOffset, fromFirst):
+        """Return a list of lists of rows, split by a sweep across the lines of notes.
+
+        Positional arguments:
+            rows -- iterable of int: row indices.
+            across -- array of float: coordinates across the lines.
+            along -- array of float: coordinates along the lines.
+            maxOffset -- float: maximum offset of a note within a line.
+            fromFirst -- bool: if True, measure the offset from the first note of the line,
+                         otherwise from the preceding note.
+
+        Sorting dominates, so this runs in O(n log n).
+        """
+        lines = []
+        line = []
+        start = None
+        for row in sorted(rows, key=lambda row: (across[row], along[row])):
+            coordinate = across[row]
+            if start is None or coordinate - start > maxOffset:
+                if line:
+                    lines.append(sorted(line, key=along.__getitem__))
+                line = []
+                start = coordinate
+            elif not fromFirst:
+                start = coordinate
+            line.append(row)
+        if line:
+            lines.append(sorted(line, key=along.__getitem__))
+        return lines
+
+    def iter_connections(self, row):
+        """Generate the UIDs connected to a note, in ascending order.
+
+        Positional arguments:
+            row -- int: row index.
+        """
+        return self._iter_ranges(self._connections, self._connectionOffsets, row)
+
+    def iter_points_to(self, row):
+        """Generate the UIDs of the notes a note points to, in ascending order.
+
+        Positional arguments:
+            row -- int: row index.
+        """
+        return self._iter_ranges(self._pointTo, self._pointToOffsets, row)
+
+    @staticmethod
+    def _iter_ranges(bounds, offsets, row):
+        for i in range(offsets[row], offsets[row + 1], 2):
+            yield from range(bounds[i], bounds[i + 1])
@@ -0,0 +1,122 @@
+"""Provide a class for streaming Scapple note parsing.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/scappex
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import xml.etree.ElementTree as ET
+
+
+class ScapReader:
+    """Incremental reader for the notes of a Scapple file.
+
+    Public methods:
+        iter_notes(filePath) -- Generate the <Note> XML subtrees of a Scapple file one by one.
+        start(tag, attrib) -- Parser target callback: element opened.
+        end(tag) -- Parser target callback: element closed.
+        data(text) -- Parser target callback: character data.
+        close() -- Parser target callback: end of document.
+
+    Public instance variables:
+        shapes -- list of the background <Shape> XML subtrees parsed so far, if requested.
+
+    The reader is used as the target of an expat based XMLParser.
+    Only the <Note> subtrees, and on request the <Shape> subtrees, are built;
+    everything else is discarded while parsing.
+    Heavy payloads are skipped entirely, so memory consumption depends on the
+    size of a single note rather than on the size of the whole file.
+    """
+    CHUNK_SIZE = 65536
+    # Number of bytes fed to the parser at once.
+
+    SKIP_TAGS = ('ImageData', 'Image', 'NoteStyles', 'UISettings', 'PrintSettings')
+    # Elements whose content is not needed for the conversion.
+
+    def __init__(self, readShapes=False):
+        """Initialize instance variables.
+
+        Optional arguments:
+            readShapes -- bool: if True, build the background shapes as well.
+        """
+        self.shapes = []
+        if readShapes:
+            self._skipTags = self.SKIP_TAGS
+            self._buildTags = ('Note', 'Shape')
+        else:
+            self._skipTags = self.SKIP_TAGS + ('BackgroundShapes',)
+            self._buildTags = ('Note',)
+        # Elements whose content is skipped, and elements whose subtrees are built.
+
+        self._builder = None
+        # TreeBuilder for the note or shape currently being parsed.
+
+        self._buildTag = None
+        # Tag of the subtree currently being built.
+
+        self._skipDepth = 0
+        # Nesting level within a skipped element.
+
+        self._notes = []
+        # Notes completed during the last feed.
+
+    def iter_notes(self, filePath):
+        """Generate the <Note> XML subtrees of a Scapple file one by one.
+
+        Positional arguments:
+            filePath -- str: path to the Scapple file.
+
+        Each note is yielded as soon as its closing tag has been parsed.
+        Raise OSError or xml.etree.ElementTree.ParseError in case of error.
+        """
+        parser = ET.XMLParser(target=self)
+        with open(filePath, 'rb') as f:
+            while True:
+                chunk = f.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                parser.feed(chunk)
+                yield from self._flush()
+        parser.close()
+        yield from self._flush()
+
+    def _flush(self):
+        """Yield and forget the notes completed so far."""
+        notes = self._notes
+        self._notes = []
+        yield from notes
+
+    def start(self, tag, attrib):
+        """Parser target callback: element opened."""
+        if self._skipDepth:
+            self._skipDepth += 1
+        elif tag in self._skipTags:
+            self._skipDepth = 1
+        elif self._builder is not None:
+            self._builder.start(tag, attrib)
+        elif tag in self._buildTags:
+            self._builder = ET.TreeBuilder()
+            self._builder.start(tag, attrib)
+            self._buildTag = tag
+
+    def end(self, tag):
+        """Parser target callback: element closed."""
+        if self._skipDepth:
+            self._skipDepth -= 1
+        elif self._builder is not None:
+            self._builder.end(tag)
+            if tag == self._buildTag:
+                if tag == 'Note':
+                    self._notes.append(self._builder.close())
+                else:
+                    self.shapes.append(self._builder.close())
+                self._builder = None
+                self._buildTag = None
+
+    def data(self, text):
+        """Parser target callback: character data."""
+        if self._builder is not None and not self._skipDepth:
+            self._builder.data(text)
+
+    def close(self):
+        """Parser target callback: end of document."""
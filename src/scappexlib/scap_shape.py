@@ -0,0 +1,69 @@
+"""Provide a class for Scapple background shape representation.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/scappex
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import zlib
+
+
+class ScapShape:
+    """Scapple background shape representation.
+
+    Public methods:
+        parse_xml -- parse a single Scapple background shape.
+        contains(x, y) -- Return True if a point lies within the shape.
+        encloses(shape) -- Return True if another shape lies within the shape.
+        fingerprint() -- Return a checksum of the shape's geometry.
+
+    Public instance variables:
+        x, y -- float: position of the upper left corner on the board.
+        width, height -- float: size of the shape.
+    """
+    __slots__ = ('x', 'y', 'width', 'height')
+
+    def __init__(self):
+        self.x = None
+        self.y = None
+        self.width = None
+        self.height = None
+
+    def parse_xml(self, xmlShape):
+        """Parse a single Scapple background shape.
+
+        Positional argument:
+            xmlShape -- Scapple <Shape> XML subtree
+
+        Write instance variables:
+        x, y, width, height
+
+        The position may comprise the size ("x,y,width,height"),
+        otherwise the size is read from the Width and Height attributes.
+        Raise ValueError or KeyError if the geometry can not be read.
+        """
+        geometry = [float(value) for value in xmlShape.attrib['Position'].split(',')]
+        if len(geometry) == 4:
+            self.x, self.y, self.width, self.height = geometry
+        else:
+            self.x, self.y = geometry[:2]
+            self.width = float(xmlShape.attrib['Width'])
+            self.height = float(xmlShape.attrib['Height'])
+        if self.width < 0:
+            self.x += self.width
+            self.width = -self.width
+        if self.height < 0:
+            self.y += self.height
+            self.height = -self.height
+
+    def contains(self, x, y):
+        """Return True if the point (x, y) lies within the shape."""
+        return self.x <= x <= self.x + self.width and self.y <= y <= self.y + self.height
+
+    def encloses(self, shape):
+        """Return True if another ScapShape instance lies within the shape."""
+        return (self.contains(shape.x, shape.y)
+                and self.contains(shape.x + shape.width, shape.y + shape.height))
+
+    def fingerprint(self):
+        """Return a CRC32 checksum of the shape's geometry as int."""
+        return zlib.crc32(repr((self.x, self.y, self.width, self.height)).encode('utf-8'))
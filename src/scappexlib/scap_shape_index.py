@@ -0,0 +1,96 @@
+"""Provide a class for the spatial index of Scapple background shapes.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/scappex
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import math
+
+
+class ScapShapeIndex:
+    """Grid index for finding the background shapes that contain a point.
+
+    Public methods:
+        find(x, y) -- Return the innermost shape containing a point.
+        iter_outline() -- Generate the shapes in reading order, with their nesting.
+
+    Public instance variables:
+        shapes -- list of ScapShape instances.
+        parents -- list: index of the innermost enclosing shape of each shape, or None.
+        children -- list of lists: indices of the shapes directly enclosed by each shape.
+
+    The board is divided into square cells about the size of an average shape.
+    Each cell lists the shapes overlapping it, so a query only tests the few
+    shapes registered in the cell of the point, instead of all shapes.
+    """
+    MIN_CELL_SIZE = 1.0
+
+    def __init__(self, shapes):
+        """Build the grid and the nesting of the shapes.
+
+        Positional arguments:
+            shapes -- list of ScapShape instances.
+        """
+        self.shapes = shapes
+        self._cellSize = self.MIN_CELL_SIZE
+        if shapes:
+            averageSize = sum(max(shape.width, shape.height) for shape in shapes) / len(shapes)
+            self._cellSize = max(averageSize, self.MIN_CELL_SIZE)
+        self._cells = {}
+        # key: (column, row) of the cell, value: list of indices of the shapes overlapping the cell.
+
+        for i, shape in enumerate(shapes):
+            left, top = self._cell(shape.x, shape.y)
+            right, bottom = self._cell(shape.x + shape.width, shape.y + shape.height)
+            for column in range(left, right + 1):
+                for row in range(top, bottom + 1):
+                    self._cells.setdefault((column, row), []).append(i)
+
+        self.parents = []
+        self.children = [[] for __ in shapes]
+        for i, shape in enumerate(shapes):
+            parent = self._innermost(shape.x, shape.y, lambda candidate: candidate != i
+                                     and shapes[candidate].encloses(shape)
+                                     and not (shape.encloses(shapes[candidate]) and candidate > i))
+            # Of two congruent shapes, the first one encloses the second one.
+            self.parents.append(parent)
+            if parent is not None:
+                self.children[parent].append(i)
+
+    def find(self, x, y):
+        """Return the index of the innermost shape containing the point (x, y), or None."""
+        return self._innermost(x, y, lambda candidate: self.shapes[candidate].contains(x, y))
+
+    def iter_outline(self):
+        """Generate (shape index, nesting level) tuples in reading order.
+
+        Shapes at the same level are ordered from top left to bottom right,
+        and each shape is followed by the shapes it encloses.
+        """
+        stack = self._sorted([i for i, parent in enumerate(self.parents) if parent is None])
+        stack.reverse()
+        levels = {i: 0 for i in stack}
+        while stack:
+            i = stack.pop()
+            yield i, levels[i]
+            for child in reversed(self._sorted(self.children[i])):
+                levels[child] = levels[i] + 1
+                stack.append(child)
+
+    def _cell(self, x, y):
+        return math.floor(x / self._cellSize), math.floor(y / self._cellSize)
+
+    def _innermost(self, x, y, isCandidate):
+        """Return the index of the smallest shape in the cell of (x, y) accepted by isCandidate, or None."""
+        innermost = None
+        smallestArea = None
+        for candidate in self._cells.get(self._cell(x, y), ()):
+            if isCandidate(candidate):
+                area = self.shapes[candidate].width * self.shapes[candidate].height
+                if smallestArea is None or area < smallestArea:
+                    innermost = candidate
+                    smallestArea = area
+        return innermost
+
+    def _sorted(self, indices):
+        return sorted(indices, key=lambda i: (self.shapes[i].y, self.shapes[i].x))
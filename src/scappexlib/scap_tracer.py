@@ -0,0 +1,137 @@
+"""Provide a class for tracing the conversion stages.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/scappex
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import time
+import functools
+from contextlib import contextmanager
+from pywriter.converter.yw_cnv import YwCnv
+from pywriter.model.splitter import Splitter
+from pywriter.yw.yw7_file import Yw7File
+from pywriter.yw.data_files import DataFiles
+from scappexlib.scap_file import ScapFile
+
+
+class ScapTracer:
+    """Recorder of the conversion stages in Chrome trace-event format.
+
+    Public methods:
+        span(name, **args) -- Context manager recording a span.
+        instrument(cls, methodName, spanName, getArgs) -- Record a span for each call of a method.
+        trace_conversion() -- Instrument the stages of a Scapple conversion.
+        restore() -- Remove all instrumentation.
+        write(filePath) -- Write the recorded spans to a JSON file.
+
+    The trace file can be loaded into chrome://tracing or https://ui.perfetto.dev.
+    Nested spans show which part of a stage takes the time.
+    """
+
+    def __init__(self):
+        """Define instance variables."""
+        import threading
+        self._get_thread_id = threading.get_ident
+        self.events = []
+        # List of complete ("X") trace events.
+
+        self._originals = []
+        # List of (class, method name, original method) tuples.
+
+        self._startTime = time.perf_counter()
+
+    @contextmanager
+    def span(self, name, **args):
+        """Context manager recording a span with the time spent in its block.
+
+        Positional arguments:
+            name -- str: name of the span.
+
+        Optional keyword arguments are shown as arguments of the span.
+        """
+        startTime = time.perf_counter()
+        event = dict(
+            name=name,
+            ph='X',
+            ts=round((startTime - self._startTime) * 1e6, 1),
+            pid=os.getpid(),
+            tid=self._get_thread_id(),
+            args=args,
+        )
+        try:
+            yield event
+        finally:
+            event['dur'] = round((time.perf_counter() - startTime) * 1e6, 1)
+            self.events.append(event)
+
+    def instrument(self, cls, methodName, spanName, getArgs=None):
+        """Record a span for each call of a method.
+
+        Positional arguments:
+            cls -- class defining the method.
+            methodName -- str: name of the method.
+            spanName -- str: name of the span.
+
+        Optional arguments:
+            getArgs -- function taking the instance and the method's result,
+                       and returning a dict of span arguments.
+        """
+        method = cls.__dict__[methodName]
+
+        @functools.wraps(method)
+        def traced(instance, *args, **kwargs):
+            with self.span(spanName) as event:
+                result = method(instance, *args, **kwargs)
+                if getArgs is not None:
+                    event['args'].update(getArgs(instance, result))
+                return result
+
+        self._originals.append((cls, methodName, method))
+        setattr(cls, methodName, traced)
+
+    def trace_conversion(self):
+        """Instrument the stages of a Scapple conversion."""
+        self.instrument(YwCnv, 'convert', 'convert')
+        self.instrument(ScapFile, 'read', 'read source')
+        self.instrument(ScapFile, '_parse_notes', 'parse',
+                        lambda source, notes: dict(notes=len(notes)))
+        self.instrument(ScapFile, '_create_elements', 'classify',
+                        lambda source, __: dict(scenes=len(source.scenes),
+                                                characters=len(source.characters),
+                                                locations=len(source.locations),
+                                                items=len(source.items)))
+        self.instrument(ScapFile, '_create_chapters', 'layout',
+                        lambda source, __: dict(chapters=len(source.chapters)))
+        self.instrument(ScapFile, '_resolve_relationships', 'resolve relationships')
+        self.instrument(Yw7File, 'read', 'read target',
+                        lambda target, __: dict(scenes=len(target.scenes)))
+        self.instrument(Yw7File, 'merge', 'merge',
+                        lambda target, __: dict(scenes=len(target.scenes)))
+        self.instrument(DataFiles, 'merge', 'merge',
+                        lambda target, __: dict(characters=len(target.characters)))
+        self.instrument(Splitter, 'split_scenes', 'split')
+        self.instrument(Yw7File, '_build_element_tree', 'build tree',
+                        lambda target, __: dict(scenes=len(target.scenes)))
+        self.instrument(DataFiles, '_build_element_tree', 'build tree',
+                        lambda target, __: dict(characters=len(target.characters)))
+        self.instrument(Yw7File, '_to_xml_string', 'serialize')
+        self.instrument(Yw7File, '_write_element_tree', 'write')
+        self.instrument(DataFiles, '_write_element_tree', 'write')
+
+    def restore(self):
+        """Remove all instrumentation."""
+        while self._originals:
+            cls, methodName, method = self._originals.pop()
+            setattr(cls, methodName, method)
+
+    def write(self, filePath):
+        """Write the recorded spans to a JSON file in Chrome trace-event format.
+
+        Positional arguments:
+            filePath -- str: path of the trace file.
+        """
+        import json
+        data = dict(traceEvents=sorted(self.events, key=lambda event: event['ts']), displayTimeUnit='ms')
+        with open(filePath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
@@ -0,0 +1,77 @@
+"""Provide a class for a yWriter project kept in memory between conversions.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/scappex
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+from pywriter.pywriter_globals import ERROR
+from pywriter.yw.yw7_file import Yw7File
+
+
+class ScapWarmProject(Yw7File):
+    """yWriter 7 project that is not read again as long as it is unchanged on disk.
+
+    Public methods:
+        is_current() -- Return True if the model in memory matches the file.
+
+    After reading or writing, the size and modification time of the .yw7 file are
+    recorded. As long as they stay the same, read() keeps the model in memory,
+    so merge() does not parse the file again.
+    A model that is not current must be discarded, because reading twice
+    into the same instance duplicates the sort orders.
+    """
+
+    def __init__(self, filePath, **kwargs):
+        """Initialize instance variables.
+
+        Positional arguments:
+            filePath -- str: path to the yw7 file.
+
+        Extends the superclass constructor.
+        """
+        super().__init__(filePath, **kwargs)
+        self._fileStat = None
+        # (size, modification time) of the .yw7 file when last read or written.
+
+    def is_current(self):
+        """Return True if the model in memory matches the file."""
+        return self._fileStat is not None and self._fileStat == self._get_file_stat()
+
+    def read(self):
+        """Parse the yWriter xml file, unless the model in memory is current.
+
+        Return a message beginning with the ERROR constant in case of error.
+        Extends the superclass method.
+        """
+        if self.is_current():
+            return 'yWriter project data is up to date.'
+
+        message = super().read()
+        if not message.startswith(ERROR):
+            self._fileStat = self._get_file_stat()
+        else:
+            self._fileStat = None
+        return message
+
+    def write(self):
+        """Write instance variables to the yWriter xml file, and record the file state.
+
+        Return a message beginning with the ERROR constant in case of error.
+        Extends the superclass method.
+        """
+        message = super().write()
+        if message.startswith(ERROR):
+            self._fileStat = None
+        else:
+            self._fileStat = self._get_file_stat()
+        return message
+
+    def _get_file_stat(self):
+        """Return size and modification time of the .yw7 file, or None if it is missing."""
+        try:
+            stat = os.stat(self.filePath)
+        except OSError:
+            return None
+
+        return stat.st_size, stat.st_mtime_ns
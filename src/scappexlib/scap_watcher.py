@@ -0,0 +1,116 @@
+"""Provide a class for continuous Scapple to yWriter synchronization.
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/scappex
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import time
+from pywriter.pywriter_globals import ERROR
+from pywriter.yw.yw7_file import Yw7File
+from scappexlib.scap_file import ScapFile
+from scappexlib.scap_warm_project import ScapWarmProject
+
+
+class ScapWatcher:
+    """Watcher merging a Scapple file into its yWriter project whenever it is saved.
+
+    Public methods:
+        sync() -- Merge the Scapple file into the yWriter project and write it.
+        watch(maxSyncs) -- Generate a message for each synchronization.
+
+    The Scapple file is polled for changes of size and modification time.
+    A synchronization starts when the file has stayed unchanged for the debounce
+    time, so a burst of saves results in a single synchronization.
+    The yWriter project is kept in memory between synchronizations,
+    unless it is modified by another application.
+    """
+    POLL_INTERVAL = 0.5
+    # Seconds between two checks of the Scapple file.
+
+    DEBOUNCE_TIME = 1.0
+    # Seconds the Scapple file must stay unchanged before synchronizing.
+
+    LOCK_INTERVAL = 1.0
+    # Seconds between two checks whether yWriter has closed the project.
+
+    def __init__(self, sourcePath, **kwargs):
+        """Store the conversion parameters.
+
+        Positional arguments:
+            sourcePath -- str: path to the Scapple file.
+
+        Required keyword arguments:
+            The settings and options required by ScapFile.
+        """
+        self._sourcePath = sourcePath
+        self._kwargs = kwargs
+        fileName, __ = os.path.splitext(sourcePath)
+        self._projectPath = f'{fileName}{Yw7File.EXTENSION}'
+        self._project = None
+        # ScapWarmProject instance kept between the synchronizations.
+
+    def sync(self):
+        """Merge the Scapple file into the yWriter project and write it.
+
+        If yWriter has the project open, wait until it is closed.
+        Return a message beginning with the ERROR constant in case of error.
+        """
+        source = ScapFile(self._sourcePath, **self._kwargs)
+        message = source.read()
+        if message.startswith(ERROR):
+            return message
+
+        if self._project is None:
+            self._project = ScapWarmProject(self._projectPath, **self._kwargs)
+        while self._project.is_locked():
+            time.sleep(self.LOCK_INTERVAL)
+        if not self._project.is_current():
+            # yWriter may have saved the project while locked; never read it again into the same instance.
+            self._project = ScapWarmProject(self._projectPath, **self._kwargs)
+        message = self._project.merge(source)
+        if not message.startswith(ERROR):
+            message = self._project.write()
+        if message.startswith(ERROR):
+            self._project = None
+        return message
+
+    def watch(self, maxSyncs=None):
+        """Generate a message for each synchronization.
+
+        Optional arguments:
+            maxSyncs -- int: number of synchronizations after which to stop. Default: run forever.
+
+        Synchronize once at the start, and then each time the Scapple file has changed.
+        """
+        syncs = 0
+        syncedState = self._get_source_state()
+        while True:
+            yield self.sync()
+            syncs += 1
+            if maxSyncs is not None and syncs >= maxSyncs:
+                return
+
+            pendingState = syncedState
+            changedAt = None
+            while True:
+                time.sleep(self.POLL_INTERVAL)
+                state = self._get_source_state()
+                if state != pendingState:
+                    # The file is being saved; wait until it is stable.
+                    pendingState = state
+                    changedAt = time.monotonic()
+                elif changedAt is not None and state is not None:
+                    if time.monotonic() - changedAt >= self.DEBOUNCE_TIME:
+                        break
+
+            syncedState = pendingState
+
+    def _get_source_state(self):
+        """Return size and modification time of the Scapple file, or None if it is missing."""
+        try:
+            stat = os.stat(self._sourcePath)
+        except OSError:
+            return None
+
+        return stat.st_size, stat.st_mtime_ns
@@ -0,0 +1,133 @@
+"""Performance regression test for the scappex project.
+
+Convert synthetic Scapple boards and compare the time and the peak memory
+of each conversion stage, as well as the size of the model objects,
+with a committed baseline.
+
+The times are scaled by a calibration run, so the baseline can be used on
+machines of different speed. To record a new baseline, e.g. after an
+intended change, run the test with the environment variable
+SCAPPEX_UPDATE_BASELINE set.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/scappex
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import sys
+import json
+import time
+import platform
+import tempfile
+import unittest
+
+sys.path.insert(0, f'{os.path.dirname(os.path.abspath(__file__))}/../tools')
+from make_board import make_board
+from benchmark import time_stages
+from benchmark import trace_stages
+from benchmark import model_memory
+
+# Test environment
+
+# The paths are relative to the "test" directory,
+# where this script is placed and executed
+
+TEST_PATH = os.getcwd() + '/../test'
+TEST_DATA_PATH = TEST_PATH + '/data/'
+
+# To be placed in TEST_DATA_PATH:
+BASELINE = TEST_DATA_PATH + 'performance_baseline.json'
+
+BOARD_SIZES = (1000, 4000)
+# Two sizes, so that a stage growing faster than linear stands out.
+
+REPEAT = 3
+# Runs per board; the fastest time of each stage is compared.
+
+TIME_TOLERANCE = 2.0
+TIME_MARGIN = 0.03
+# A stage regresses if it takes longer than TIME_TOLERANCE times the scaled baseline plus TIME_MARGIN seconds.
+
+MEMORY_TOLERANCE = 1.3
+MEMORY_MARGIN = 256
+# A stage regresses if its peak exceeds MEMORY_TOLERANCE times the baseline plus MEMORY_MARGIN KiB.
+
+
+def calibrate():
+    """Return the time in seconds of a fixed workload, for scaling the baseline times."""
+    best = None
+    for __ in range(5):
+        startTime = time.perf_counter()
+        elements = {}
+        for i in range(100000):
+            elements[str(i)] = f'Note {i} & <text>'.replace('&', '&amp;')
+        ''.join(sorted(elements.values()))
+        seconds = time.perf_counter() - startTime
+        if best is None or seconds < best:
+            best = seconds
+    return best
+
+
+def measure(workDir):
+    """Return the stage timings and memory peaks for each board size."""
+    results = {}
+    for notes in BOARD_SIZES:
+        boardPath = os.path.join(workDir, f'board_{notes}.scap')
+        make_board(boardPath, notes)
+        seconds = {}
+        for __ in range(REPEAT):
+            for stage, duration in time_stages(boardPath).items():
+                seconds[stage] = min(duration, seconds.get(stage, duration))
+        results[str(notes)] = dict(seconds=seconds, peak_kib=trace_stages(boardPath))
+    return results
+
+
+class PerformanceRegression(unittest.TestCase):
+    """Test case: Conversion stages stay within the baseline."""
+
+    @classmethod
+    def setUpClass(cls):
+        with tempfile.TemporaryDirectory() as workDir:
+            cls.results = measure(workDir)
+        cls.calibration = calibrate()
+        cls.modelBytes = model_memory()
+        if os.environ.get('SCAPPEX_UPDATE_BASELINE'):
+            data = dict(
+                python=platform.python_version(),
+                calibration=cls.calibration,
+                boards=cls.results,
+                model_bytes=cls.modelBytes,
+            )
+            with open(BASELINE, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+                f.write('\n')
+        with open(BASELINE, 'r', encoding='utf-8') as f:
+            cls.baseline = json.load(f)
+
+    def test_stage_times(self):
+        scale = self.calibration / self.baseline['calibration']
+        for notes, boardBaseline in self.baseline['boards'].items():
+            for stage, baseSeconds in boardBaseline['seconds'].items():
+                with self.subTest(notes=notes, stage=stage):
+                    limit = baseSeconds * scale * TIME_TOLERANCE + TIME_MARGIN
+                    self.assertLessEqual(self.results[notes]['seconds'][stage], limit)
+
+    def test_stage_memory(self):
+        for notes, boardBaseline in self.baseline['boards'].items():
+            for stage, basePeak in boardBaseline['peak_kib'].items():
+                with self.subTest(notes=notes, stage=stage):
+                    limit = basePeak * MEMORY_TOLERANCE + MEMORY_MARGIN
+                    self.assertLessEqual(self.results[notes]['peak_kib'][stage], limit)
+
+    def test_model_memory(self):
+        for modelClass, baseSize in self.baseline['model_bytes'].items():
+            with self.subTest(modelClass=modelClass):
+                self.assertLessEqual(self.modelBytes[modelClass], baseSize * MEMORY_TOLERANCE)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
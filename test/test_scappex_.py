@@ -6,7 +6,11 @@ Published under the MIT License (https://opensource.org/licenses/mit-license.php
 """
 from shutil import copyfile
 import os
+import sys
+import json
 import unittest
+import subprocess
+from importlib.util import find_spec
 import scappex_
 
 # Test environment
@@ -25,13 +29,18 @@ NORMAL_CHARACTERS_XML = TEST_DATA_PATH + 'normal_Characters.xml'
 NORMAL_LOCATIONS_XML = TEST_DATA_PATH + 'normal_Locations.xml'
 NORMAL_ITEMS_XML = TEST_DATA_PATH + 'normal_Items.xml'
 INI_FILE = 'scappex.ini'
+REPORT_FILE = 'scappex_report.csv'
 
 # Test data
 TEST_YW7 = TEST_EXEC_PATH + 'yw7 Sample Project.yw7'
+TEST_YW7_BAK = TEST_YW7 + '.bak'
+TEST_YW7_LOCK = TEST_YW7 + '.lock'
 TEST_SCAP = TEST_EXEC_PATH + 'yw7 Sample Project.scap'
 TEST_CHARACTERS_XML = TEST_EXEC_PATH + 'yw7 Sample Project_Characters.xml'
 TEST_LOCATIONS_XML = TEST_EXEC_PATH + 'yw7 Sample Project_Locations.xml'
 TEST_ITEMS_XML = TEST_EXEC_PATH + 'yw7 Sample Project_Items.xml'
+TEST_CACHE = TEST_SCAP + '.cache'
+TEST_TRACE = TEST_EXEC_PATH + 'trace.json'
 
 
 def read_file(inputFile):
@@ -52,6 +61,16 @@ def remove_all_testfiles():
     except:
         pass
 
+    try:
+        os.remove(TEST_YW7_BAK)
+    except:
+        pass
+
+    try:
+        os.remove(TEST_YW7_LOCK)
+    except:
+        pass
+
     try:
         os.remove(TEST_SCAP)
     except:
@@ -62,6 +81,21 @@ def remove_all_testfiles():
     except:
         pass
 
+    try:
+        os.remove(TEST_EXEC_PATH + REPORT_FILE)
+    except:
+        pass
+
+    try:
+        os.remove(TEST_CACHE)
+    except:
+        pass
+
+    try:
+        os.remove(TEST_TRACE)
+    except:
+        pass
+
     try:
         os.remove(TEST_CHARACTERS_XML)
     except:
@@ -106,6 +140,387 @@ class NormalOperation(unittest.TestCase):
         self.assertEqual(read_file(TEST_LOCATIONS_XML), read_file(NORMAL_LOCATIONS_XML))
         self.assertEqual(read_file(TEST_ITEMS_XML), read_file(NORMAL_ITEMS_XML))
 
+    def test_scap_to_data_unchanged(self):
+        copyfile(NORMAL_SCAP, TEST_SCAP)
+        copyfile(NORMAL_YW7, TEST_YW7)
+        os.chdir(TEST_EXEC_PATH)
+        scappex_.run(TEST_SCAP, silentMode=True)
+        os.utime(TEST_CHARACTERS_XML, (0, 0))
+        scappex_.run(TEST_SCAP, silentMode=True)
+        self.assertEqual(os.stat(TEST_CHARACTERS_XML).st_mtime, 0)
+        self.assertEqual(read_file(TEST_CHARACTERS_XML), read_file(NORMAL_CHARACTERS_XML))
+
+    def test_scap_to_data_cached(self):
+        copyfile(NORMAL_SCAP, TEST_SCAP)
+        copyfile(NORMAL_YW7, TEST_YW7)
+        with open(TEST_EXEC_PATH + INI_FILE, 'w', encoding='utf-8') as f:
+            f.write('[OPTIONS]\nuse_cache = Yes\n')
+        os.chdir(TEST_EXEC_PATH)
+        scappex_.run(TEST_SCAP, silentMode=True)
+        self.assertTrue(os.path.isfile(TEST_CACHE))
+        os.remove(TEST_CHARACTERS_XML)
+        os.remove(TEST_LOCATIONS_XML)
+        os.remove(TEST_ITEMS_XML)
+        scappex_.run(TEST_SCAP, silentMode=True)
+        self.assertEqual(read_file(TEST_CHARACTERS_XML), read_file(NORMAL_CHARACTERS_XML))
+        self.assertEqual(read_file(TEST_LOCATIONS_XML), read_file(NORMAL_LOCATIONS_XML))
+        self.assertEqual(read_file(TEST_ITEMS_XML), read_file(NORMAL_ITEMS_XML))
+
+    def test_scap_to_data_fingerprints(self):
+        from scappexlib.scap_converter import ScapConverter
+        copyfile(NORMAL_SCAP, TEST_SCAP)
+        with open(TEST_EXEC_PATH + INI_FILE, 'w', encoding='utf-8') as f:
+            f.write('[OPTIONS]\nuse_cache = Yes\n')
+        os.chdir(TEST_EXEC_PATH)
+        kwargs = scappex_.get_configuration(TEST_SCAP)
+        converter = ScapConverter()
+        converter.run(TEST_SCAP, **kwargs)
+        self.assertEqual(read_file(TEST_YW7), read_file(NORMAL_YW7))
+        self.assertTrue(os.path.isfile(TEST_CACHE))
+        converter.run(TEST_SCAP, **kwargs)
+        self.assertEqual(read_file(TEST_CHARACTERS_XML), read_file(NORMAL_CHARACTERS_XML))
+
+        # Saving the board with another zoom factor does not change the notes.
+        board = read_file(NORMAL_SCAP)
+        with open(TEST_SCAP, 'w', encoding='utf-8') as f:
+            f.write(board.replace('ScaleFactor="1.000000"', 'ScaleFactor="0.500000"'))
+        converter.run(TEST_SCAP, **kwargs)
+        self.assertEqual(converter.ui.infoHowText, f'No changes: "{os.path.normpath(TEST_SCAP)}".')
+        self.assertIsNotNone(converter.newFile)
+
+        with open(TEST_SCAP, 'w', encoding='utf-8') as f:
+            f.write(board.replace('<String>Major Character 1</String>', '<String>Major Character 3</String>'))
+        converter.run(TEST_SCAP, **kwargs)
+        self.assertEqual(converter.ui.infoHowText, 'All XML data files written.')
+        self.assertIn('Major Character 3', read_file(TEST_CHARACTERS_XML))
+
+    def test_trace(self):
+        copyfile(NORMAL_SCAP, TEST_SCAP)
+        os.chdir(TEST_EXEC_PATH)
+        scappex_.run(TEST_SCAP, silentMode=True, tracePath=TEST_TRACE)
+        self.assertEqual(read_file(TEST_YW7), read_file(NORMAL_YW7))
+        with open(TEST_TRACE, 'r', encoding='utf-8') as f:
+            events = json.load(f)['traceEvents']
+        spans = [event['name'] for event in events]
+        for stage in ('parse', 'classify', 'layout', 'resolve relationships', 'merge', 'build tree', 'serialize', 'write'):
+            self.assertIn(stage, spans)
+
+    def test_xml_attributes(self):
+        from xml.etree import ElementTree as ET
+        from pywriter.yw.xml_cdata import to_xml_string
+        root = ET.Element('ROOT', {'Value': 'a < b & "c"\r\n\td'})
+        ET.SubElement(root, 'Title').text = 'Title'
+        xmlString = to_xml_string(root, ('Title',))
+        self.assertIn('<ROOT Value="a &lt; b &amp; &quot;c&quot;&#13;&#10;&#09;d">', xmlString)
+        self.assertEqual(ET.fromstring(xmlString.encode('utf-8')).attrib, root.attrib)
+
+    def test_stored_counts(self):
+        from zlib import crc32
+        from pywriter.yw.yw7_file import Yw7File
+        content = 'one two three'
+        validChecksum = f'{crc32(content.encode("utf-8")):08x}'
+        for checksum, wordCount in ((validChecksum, 99), ('00000000', 3), (None, 3)):
+            with self.subTest(checksum=checksum):
+                scene = (f'<SceneContent><![CDATA[{content}]]></SceneContent>\n'
+                         '      <WordCount>99</WordCount>\n'
+                         '      <LetterCount>99</LetterCount>')
+                if checksum is not None:
+                    scene += f'\n      <Fields>\n        <Field_ContentChecksum>{checksum}</Field_ContentChecksum>\n      </Fields>'
+                with open(TEST_YW7, 'w', encoding='utf-8') as f:
+                    f.write(read_file(NORMAL_YW7).replace(
+                        '<SceneContent />\n      <WordCount>0</WordCount>\n      <LetterCount>0</LetterCount>', scene, 1))
+                project = Yw7File(TEST_YW7)
+                project.read()
+                self.assertEqual(project.scenes['1'].wordCount, wordCount)
+
+    def test_silent_imports(self):
+        copyfile(NORMAL_SCAP, TEST_SCAP)
+        os.chdir(TEST_EXEC_PATH)
+        code = f'import sys, scappex_; scappex_.run({TEST_SCAP!r}, silentMode=True); print(*sorted(sys.modules))'
+        modules = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True).stdout.split()
+        self.assertIn('scappex_', modules)
+        for module in ('tkinter', 'multiprocessing', 'hashlib', 'json', 'configparser', 'numpy', 'locale',
+                       'pywriter.ui.ui_tk', 'scappexlib.scap_batch', 'scappexlib.scap_watcher',
+                       'scappexlib.scap_tracer'):
+            self.assertNotIn(module, modules)
+        self.assertEqual(read_file(TEST_YW7), read_file(NORMAL_YW7))
+
+    def test_color_tags(self):
+        copyfile(NORMAL_SCAP, TEST_SCAP)
+        os.chdir(TEST_EXEC_PATH)
+        with open(INI_FILE, 'w', encoding='utf-8') as f:
+            f.write('[SETTINGS]\ncolor_tags = Plot:0.05 0.0 0.0;Tag 1:0.3 0.3 0.0\n')
+        scappex_.run(TEST_SCAP, silentMode=True)
+        yw7 = read_file(TEST_YW7)
+        self.assertIn('<Tags><![CDATA[Plot;Tag 1]]></Tags>', yw7)
+        self.assertEqual(yw7.count('<Tags><![CDATA[Plot'), 3)
+
+    def test_scene_order(self):
+        board = read_file(NORMAL_SCAP)
+        board = board.replace('ID="0" Position="223.5,107.5"', 'ID="0" Position="20000.0,110.4"')
+        # With y * 100000 + x, scene 0 would come after scene 6 at (418.0, 110.5).
+        with open(TEST_SCAP, 'w', encoding='utf-8') as f:
+            f.write(board)
+        os.chdir(TEST_EXEC_PATH)
+        scappex_.run(TEST_SCAP, silentMode=True)
+        self.assertIn('<ScID>11</ScID>\n        <ScID>1</ScID>\n        <ScID>7</ScID>', read_file(TEST_YW7))
+        os.remove(TEST_YW7)
+        with open(INI_FILE, 'w', encoding='utf-8') as f:
+            f.write('[SETTINGS]\nscene_row_tolerance = 5\n')
+        scappex_.run(TEST_SCAP, silentMode=True)
+        self.assertIn('<ScID>11</ScID>\n        <ScID>7</ScID>\n        <ScID>1</ScID>', read_file(TEST_YW7))
+
+    def test_chapter_layout(self):
+        copyfile(NORMAL_SCAP, TEST_SCAP)
+        os.chdir(TEST_EXEC_PATH)
+        with open(INI_FILE, 'w', encoding='utf-8') as f:
+            f.write('[SETTINGS]\nchapter_layout = rows\n')
+        scappex_.run(TEST_SCAP, silentMode=True)
+        yw7 = read_file(TEST_YW7)
+        self.assertIn('<Title><![CDATA[Chapter 2]]></Title>', yw7)
+        self.assertNotIn('<Title><![CDATA[Chapter 3]]></Title>', yw7)
+        self.assertIn('<Scenes>\n        <ScID>11</ScID>\n      </Scenes>', yw7)
+        self.assertIn('<Scenes>\n        <ScID>1</ScID>\n        <ScID>7</ScID>\n      </Scenes>', yw7)
+
+    def test_chapter_shapes(self):
+        shapes = ('<BackgroundShapes>'
+                  '<Shape Type="RoundedRectangle" Position="0.0,0.0,700.0,320.0"/>'
+                  '<Shape Type="RoundedRectangle" Position="100.0,0.0,200.0,150.0"/>'
+                  '<Shape Type="RoundedRectangle" Position="400.0,100.0" Width="200.0" Height="120.0"/>'
+                  '</BackgroundShapes>')
+        with open(TEST_SCAP, 'w', encoding='utf-8') as f:
+            f.write(read_file(NORMAL_SCAP).replace('<BackgroundShapes/>', shapes))
+        os.chdir(TEST_EXEC_PATH)
+        with open(INI_FILE, 'w', encoding='utf-8') as f:
+            f.write('[SETTINGS]\nchapter_layout = shapes\n')
+        scappex_.run(TEST_SCAP, silentMode=True)
+        yw7 = read_file(TEST_YW7)
+        self.assertIn('<Title><![CDATA[This text is not exported]]></Title>\n      <SectionStart>-1</SectionStart>', yw7)
+        self.assertIn('<Title><![CDATA[Chapter 2]]></Title>', yw7)
+        self.assertIn('<Title><![CDATA[This text is not exported.]]></Title>', yw7)
+        self.assertIn('<Scenes>\n        <ScID>11</ScID>\n        <ScID>1</ScID>\n      </Scenes>', yw7)
+        self.assertIn('<Scenes>\n        <ScID>7</ScID>\n      </Scenes>', yw7)
+
+    def test_watch(self):
+        copyfile(NORMAL_SCAP, TEST_SCAP)
+        os.chdir(TEST_EXEC_PATH)
+        scappex_.run_watch(TEST_SCAP, maxSyncs=1)
+        self.assertEqual(read_file(TEST_YW7), read_file(NORMAL_YW7))
+
+    def test_watch_resync(self):
+        from scappexlib.scap_watcher import ScapWatcher
+        copyfile(NORMAL_SCAP, TEST_SCAP)
+        os.chdir(TEST_EXEC_PATH)
+        watcher = ScapWatcher(TEST_SCAP, **scappex_.get_configuration(TEST_SCAP))
+        watcher.sync()
+        self.assertEqual(read_file(TEST_YW7), read_file(NORMAL_YW7))
+        project = watcher._project
+        with open(TEST_SCAP, 'w', encoding='utf-8') as f:
+            f.write(read_file(NORMAL_SCAP).replace('<String>scene 1</String>', '<String>scene one</String>'))
+        watcher.sync()
+        # The project is unchanged on disk, so the model in memory is merged into.
+        self.assertIs(watcher._project, project)
+        yw7 = read_file(TEST_YW7)
+        self.assertIn('<Title><![CDATA[scene one]]></Title>', yw7)
+        self.assertEqual(yw7, read_file(NORMAL_YW7).replace('scene 1]]>', 'scene one]]>'))
+
+    def test_watch_reload(self):
+        from scappexlib.scap_watcher import ScapWatcher
+        copyfile(NORMAL_SCAP, TEST_SCAP)
+        os.chdir(TEST_EXEC_PATH)
+        watcher = ScapWatcher(TEST_SCAP, **scappex_.get_configuration(TEST_SCAP))
+        watcher.sync()
+        project = watcher._project
+        with open(TEST_YW7, 'w', encoding='utf-8') as f:
+            f.write(read_file(NORMAL_YW7).replace('<Status>1</Status>', '<Status>1</Status>\n      <Goal><![CDATA[Goal 1]]></Goal>', 1))
+        os.utime(TEST_YW7, ns=(0, 0))
+        # The project has been changed by another application.
+        watcher.sync()
+        self.assertIsNot(watcher._project, project)
+        self.assertIn('<Goal><![CDATA[Goal 1]]></Goal>', read_file(TEST_YW7))
+
+    def test_watch_locked(self):
+        import threading
+        from scappexlib.scap_watcher import ScapWatcher
+        copyfile(NORMAL_SCAP, TEST_SCAP)
+        project = read_file(NORMAL_YW7)
+        with open(TEST_YW7, 'w', encoding='utf-8') as f:
+            f.write(project.replace('<Scenes>\n        <ScID>11</ScID>', '<Scenes>\n        <ScID>99</ScID>\n        <ScID>11</ScID>').replace(
+                '<SCENES>\n', '<SCENES>\n    <SCENE>\n      <ID>99</ID>\n      <Title><![CDATA[yWriter scene]]></Title>\n'
+                '      <BelongsToChID>1</BelongsToChID>\n      <SceneContent />\n    </SCENE>\n'))
+        os.chdir(TEST_EXEC_PATH)
+        watcher = ScapWatcher(TEST_SCAP, **scappex_.get_configuration(TEST_SCAP))
+        watcher.LOCK_INTERVAL = 0.05
+        watcher.sync()
+        self.assertIn('<ID>99</ID>', read_file(TEST_YW7))
+
+        def close_yw():
+            # yWriter deletes the scene and saves the project before closing it.
+            with open(TEST_YW7, 'w', encoding='utf-8') as f:
+                f.write(project)
+            os.remove(TEST_YW7_LOCK)
+
+        open(TEST_YW7_LOCK, 'w').close()
+        timer = threading.Timer(0.2, close_yw)
+        timer.start()
+        watcher.sync()
+        timer.join()
+        self.assertEqual(read_file(TEST_YW7), project)
+
+    def test_watch_duplicate_scenes(self):
+        copyfile(NORMAL_SCAP, TEST_SCAP)
+        with open(TEST_YW7, 'w', encoding='utf-8') as f:
+            f.write(read_file(NORMAL_YW7).replace('<ScID>1</ScID>\n        <ScID>7</ScID>',
+                                                  '<ScID>7</ScID>\n        <ScID>11</ScID>'))
+        os.chdir(TEST_EXEC_PATH)
+        scappex_.run_watch(TEST_SCAP, maxSyncs=1)
+        self.assertIn('<Scenes>\n        <ScID>11</ScID>\n        <ScID>1</ScID>\n        <ScID>7</ScID>\n'
+                      '        <ScID>11</ScID>\n      </Scenes>', read_file(TEST_YW7))
+
+    def test_batch(self):
+        copyfile(NORMAL_SCAP, TEST_SCAP)
+        os.chdir(TEST_EXEC_PATH)
+        results = scappex_.run_batch([TEST_EXEC_PATH], workers=2, reportPath=REPORT_FILE)
+        self.assertEqual(results[0][1], 'OK')
+        self.assertEqual(read_file(TEST_YW7), read_file(NORMAL_YW7))
+        self.assertTrue(os.path.isfile(TEST_EXEC_PATH + REPORT_FILE))
+
+    def tearDown(self):
+        remove_all_testfiles()
+
+
+class Components(unittest.TestCase):
+    """Test case: Single components."""
+
+    @unittest.skipUnless(find_spec('numpy'), 'NumPy is not installed')
+    def test_classify_all_vectorized(self):
+        from scappexlib.scap_color import ScapColorClassifier
+        palette = [('a', '1.0 0.0 0.0'), ('b', '0.9 0.1 0.0'), ('c', '0.0 0.0 1.0'), ('d', '0.0 0.0 1.0')]
+        colorStrs = [f'{r / 20} {g / 20} {b / 20}' for r in range(21) for g in range(0, 21, 4) for b in range(0, 21, 4)]
+        colorStrs.extend(['', 'no color', '1.0 0.0 0.0'])
+        # Ties between palette entries, colors out of tolerance, malformed and repeated strings.
+        classifier = ScapColorClassifier(palette)
+        classifier.VECTORIZE_MIN = 0
+        vectorized = classifier.classify_all(colorStrs)
+        self.assertIn('numpy', sys.modules)
+        classifier = ScapColorClassifier(palette)
+        self.assertEqual(vectorized, [classifier.classify(colorStr) for colorStr in colorStrs])
+        self.assertEqual(set(vectorized), {'a', 'b', 'c', None})
+
+    def test_reader_skips(self):
+        from scappexlib.scap_reader import ScapReader
+        with open(TEST_SCAP, 'w', encoding='utf-8') as f:
+            f.write('<ScappleDocument><Notes>'
+                    '<Note ID="0"><String>one</String><ImageData>' + 'A' * 1000 + '</ImageData></Note>'
+                    '<Note ID="1"><String>two</String><Appearance><TextColor>1.0 0.0 0.0</TextColor></Appearance></Note>'
+                    '</Notes>'
+                    '<BackgroundShapes><Shape Type="Rectangle"/></BackgroundShapes>'
+                    '<NoteStyles><Style><Note ID="2"/></Style></NoteStyles>'
+                    '<UISettings><Note ID="3"/></UISettings>'
+                    '</ScappleDocument>')
+        reader = ScapReader()
+        reader.CHUNK_SIZE = 16
+        notes = list(reader.iter_notes(TEST_SCAP))
+        self.assertEqual([note.attrib['ID'] for note in notes], ['0', '1'])
+        self.assertEqual([child.tag for child in notes[0]], ['String'])
+        self.assertEqual(notes[1].findtext('Appearance/TextColor'), '1.0 0.0 0.0')
+        self.assertEqual(reader.shapes, [])
+        reader = ScapReader(readShapes=True)
+        self.assertEqual(len(list(reader.iter_notes(TEST_SCAP))), 2)
+        self.assertEqual([shape.attrib['Type'] for shape in reader.shapes], ['Rectangle'])
+
+    def test_id_ranges(self):
+        from scappexlib.scap_id_ranges import ScapIdRanges
+        for idList, ranges in (
+                ('', []),
+                ('7', [(8, 9)]),
+                ('12, 1-2, 4-5', [(2, 4), (5, 7), (13, 14)]),
+                ('3-9, 1-4, 5, 11, 10', [(2, 13)]),
+                ('0-40000, 40002', [(1, 40002), (40003, 40004)]),
+                ):
+            with self.subTest(idList=idList):
+                uids = ScapIdRanges(idList)
+                self.assertEqual(list(uids.iter_ranges()), ranges)
+                expanded = [uid for start, stop in ranges for uid in range(start, stop)]
+                self.assertEqual(list(uids), expanded)
+                self.assertEqual(len(uids), len(expanded))
+                self.assertEqual(bool(uids), bool(expanded))
+                candidates = set(range(16))
+                for start, stop in ranges:
+                    candidates.update((start - 1, start, stop - 1, stop))
+                for uid in candidates:
+                    self.assertEqual(uid in uids, uid in expanded, uid)
+                self.assertEqual('8' in uids, 8 in expanded)
+
+    def test_graph(self):
+        import xml.etree.ElementTree as ET
+        from scappexlib.scap_note import ScapNote
+        from scappexlib.scap_note_table import ScapNoteTable
+        from scappexlib.scap_graph import ScapGraph
+        table = ScapNoteTable()
+        note = ScapNote()
+        for xmlNote in (
+                '<Note ID="2" Position="0.0,0.0"><String>c</String><Appearance/></Note>',
+                '<Note ID="0" Position="0.0,0.0"><String>a</String><Appearance/>'
+                '<ConnectedNoteIDs>1, 5</ConnectedNoteIDs><PointsToNoteIDs>5, 1</PointsToNoteIDs></Note>',
+                '<Note ID="1" Position="0.0,0.0"><String>b</String><Appearance/>'
+                '<ConnectedNoteIDs>0</ConnectedNoteIDs></Note>',
+                ):
+            note.parse_xml(ET.fromstring(xmlNote))
+            table.append(note)
+        # Note 5 does not exist.
+        graph = ScapGraph(table)
+        self.assertEqual(list(graph.uids), [1, 2, 3])
+        self.assertEqual(list(graph.edges()), [(1, 2), (1, 6), (2, 1)])
+        self.assertEqual(list(graph.neighbors(1)), [2, 6])
+        self.assertEqual(list(graph.neighbors(3)), [])
+        self.assertEqual(list(graph.neighbors(6)), [])
+        self.assertTrue(graph.points_to(1, 2))
+        self.assertTrue(graph.points_to(1, 6))
+        self.assertFalse(graph.points_to(2, 1))
+        self.assertFalse(graph.points_to(6, 1))
+        self.assertFalse(graph.points_to(3, 3))
+
+    def test_note_table(self):
+        import xml.etree.ElementTree as ET
+        from scappexlib.scap_note import ScapNote
+        from scappexlib.scap_note_table import ScapNoteTable
+        table = ScapNoteTable()
+        note = ScapNote()
+        rows = (
+            ('<Note ID="0" Position="1.5,2.5" Shadow="Yes"><String>Scène 1</String>'
+             '<Appearance><Border Style="Cloud"/></Appearance>'
+             '<ConnectedNoteIDs>3-5, 1</ConnectedNoteIDs><PointsToNoteIDs>4</PointsToNoteIDs></Note>',
+             'Scène 1', ScapNoteTable.SCENE | ScapNoteTable.NOTES_SCENE, [2, 4, 5, 6], [5]),
+            ('<Note ID="1" Position="3.0,4.0"><String>Tag 1</String>'
+             '<Appearance><TextColor>1.0 0.0 0.0</TextColor><Border Style="Square"/></Appearance></Note>',
+             'Tag 1', ScapNoteTable.TAG, [], []),
+            ('<Note ID="2" Position="5.0,6.0"><String/><Appearance><Border Style="Cloud"/></Appearance></Note>',
+             None, ScapNoteTable.NOTE | ScapNoteTable.NO_TEXT, [], []),
+            ('<Note ID="40000" Position="7.0,8.0"><String>Anna</String>'
+             '<Appearance><TextColor>1.0 0.0 0.0</TextColor></Appearance>'
+             '<ConnectedNoteIDs>0</ConnectedNoteIDs></Note>',
+             'Anna', 0, [1], []),
+            )
+        for i, (xmlNote, text, flags, connections, pointTo) in enumerate(rows):
+            note.parse_xml(ET.fromstring(xmlNote))
+            table.append(note)
+            if i == 1:
+                # Join the texts before all notes are appended.
+                self.assertEqual(table.text(0), 'Scène 1')
+        self.assertEqual(len(table), 4)
+        self.assertEqual(list(table.uids), [1, 2, 3, 40001])
+        self.assertEqual(list(table.xs), [1.5, 3.0, 5.0, 7.0])
+        self.assertEqual(list(table.ys), [2.5, 4.0, 6.0, 8.0])
+        self.assertEqual(table.palette, ['', '1.0 0.0 0.0'])
+        self.assertEqual(list(table.colors), [0, 1, 0, 1])
+        for row, (xmlNote, text, flags, connections, pointTo) in enumerate(rows):
+            with self.subTest(row=row):
+                self.assertEqual(table.text(row), text)
+                self.assertEqual(table.flags[row], flags)
+                self.assertEqual(list(table.iter_connections(row)), connections)
+                self.assertEqual(list(table.iter_points_to(row)), pointTo)
+
     def tearDown(self):
         remove_all_testfiles()
 
@@ -0,0 +1,220 @@
+"""Benchmark for the scappex conversion stages.
+
+Time the conversion stages separately for synthetic boards of different sizes,
+measure the memory of each stage and of the model objects,
+and write the results to a JSON file, so they can be compared between versions.
+
+usage: benchmark.py [-h] [--sizes SIZES] [--repeat N] [--output Resultfile] [--workdir Directory]
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/scappex
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import tracemalloc
+import importlib.util
+from importlib.machinery import SourceFileLoader
+
+SRC = f'{os.path.dirname(os.path.abspath(__file__))}/../src/'
+sys.path.insert(0, SRC)
+from pywriter.pywriter_globals import ERROR
+from pywriter.yw.yw7_file import Yw7File
+from pywriter.yw.data_files import DataFiles
+from pywriter.model.chapter import Chapter
+from pywriter.model.scene import Scene
+from pywriter.model.character import Character
+from pywriter.model.world_element import WorldElement
+from scappexlib.scap_file import ScapFile
+from scappexlib.scap_note import ScapNote
+from make_board import make_board
+
+loader = SourceFileLoader('scappex_', f'{SRC}scappex_.pyw')
+scappex_ = importlib.util.module_from_spec(importlib.util.spec_from_loader('scappex_', loader))
+loader.exec_module(scappex_)
+# The application script provides the default configuration.
+
+SIZES = '1000,10000,100000'
+MODEL_INSTANCES = 20000
+
+
+def get_kwargs():
+    """Return the keyword arguments of a conversion with the default configuration."""
+    kwargs = {'suffix': scappex_.SUFFIX}
+    kwargs.update(scappex_.SETTINGS)
+    kwargs.update(scappex_.OPTIONS)
+    return kwargs
+
+
+def run_stages(boardPath, measure):
+    """Convert a board into a new project, then update the project and write the XML data files.
+
+    Positional arguments:
+        boardPath -- str: path to the Scapple file.
+        measure -- function taking the stage name, the stage's function and its arguments;
+                   it must call the function and return its result.
+    """
+    kwargs = get_kwargs()
+    basePath, __ = os.path.splitext(boardPath)
+    projectPath = f'{basePath}{Yw7File.EXTENSION}'
+    dataPath = f'{basePath}{DataFiles.EXTENSION}'
+    for path in (projectPath, f'{projectPath}.bak', f'{basePath}_Characters.xml', f'{basePath}_Locations.xml',
+                 f'{basePath}_Items.xml'):
+        if os.path.isfile(path):
+            os.remove(path)
+
+    def checked(stage, function, *args):
+        result = measure(stage, function, *args)
+        if isinstance(result, str) and result.startswith(ERROR):
+            raise RuntimeError(result)
+
+        return result
+
+    # Create a new project.
+    source = ScapFile(boardPath, **kwargs)
+    checked('scap_read', source.read)
+    target = Yw7File(projectPath, **kwargs)
+    checked('new_merge', target.merge, source)
+    checked('new_build_element_tree', target._build_element_tree)
+    checked('new_write_element_tree', target._write_element_tree, target)
+
+    # Update the existing project; merging includes reading the project.
+    # The project does not change, so writing is reduced to comparing.
+    source = ScapFile(boardPath, **kwargs)
+    source.read()
+    target = Yw7File(projectPath, **kwargs)
+    checked('update_merge', target.merge, source)
+    checked('update_build_element_tree', target._build_element_tree)
+    checked('update_write_element_tree', target._write_element_tree, target)
+
+    # Write the XML data files, as done if the project exists.
+    source = ScapFile(boardPath, **kwargs)
+    source.read()
+    target = DataFiles(dataPath, **kwargs)
+    checked('data_merge', target.merge, source)
+    checked('data_build_element_tree', target._build_element_tree)
+    checked('data_write_element_tree', target._write_element_tree, target)
+
+
+def time_stages(boardPath):
+    """Return the time of each conversion stage in seconds.
+
+    Positional arguments:
+        boardPath -- str: path to the Scapple file.
+    """
+    timings = {}
+
+    def timed(stage, function, *args):
+        startTime = time.perf_counter()
+        result = function(*args)
+        timings[stage] = time.perf_counter() - startTime
+        return result
+
+    run_stages(boardPath, timed)
+    return timings
+
+
+def trace_stages(boardPath):
+    """Return the peak memory allocated during each conversion stage in KiB.
+
+    Positional arguments:
+        boardPath -- str: path to the Scapple file.
+
+    The peak is measured with tracemalloc, relative to the memory
+    allocated at the beginning of the stage.
+    """
+    peaks = {}
+
+    def traced(stage, function, *args):
+        startSize, __ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = function(*args)
+        __, peakSize = tracemalloc.get_traced_memory()
+        peaks[stage] = (peakSize - startSize) // 1024
+        return result
+
+    tracemalloc.start()
+    try:
+        run_stages(boardPath, traced)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def model_memory(count=MODEL_INSTANCES):
+    """Return the memory per instance of each model class in bytes.
+
+    Optional arguments:
+        count -- int: number of instances created per class.
+
+    The attributes are left at their initial values,
+    so only the memory of the objects themselves is measured.
+    """
+    sizes = {}
+    tracemalloc.start()
+    try:
+        for modelClass in (Scene, Chapter, Character, WorldElement, ScapNote):
+            startSize, __ = tracemalloc.get_traced_memory()
+            instances = [modelClass() for __ in range(count)]
+            size, __ = tracemalloc.get_traced_memory()
+            sizes[modelClass.__name__] = round((size - startSize) / count)
+            del instances
+    finally:
+        tracemalloc.stop()
+    return sizes
+
+
+def run(sizes, repeat=3, resultPath='benchmark_results.json', workDir=None):
+    """Run the benchmark and write the results.
+
+    Positional arguments:
+        sizes -- list of int: numbers of notes of the boards.
+
+    Optional arguments:
+        repeat -- int: number of runs per board; the fastest time of each stage is kept.
+        resultPath -- str: path of the JSON result file.
+        workDir -- str: directory for the generated files. Default: a temporary directory.
+    """
+    with tempfile.TemporaryDirectory() as tempDir:
+        if workDir is None:
+            workDir = tempDir
+        results = []
+        for notes in sizes:
+            boardPath = os.path.join(workDir, f'board_{notes}.scap')
+            make_board(boardPath, notes)
+            best = {}
+            for __ in range(repeat):
+                for stage, seconds in time_stages(boardPath).items():
+                    best[stage] = min(seconds, best.get(stage, seconds))
+            peaks = trace_stages(boardPath)
+            results.append(dict(notes=notes, seconds=best, peak_kib=peaks))
+            print(f'{notes:>7} notes: ' + ', '.join(f'{stage} {seconds:.3f}s' for stage, seconds in best.items()))
+            print(f'{notes:>7} notes: ' + ', '.join(f'{stage} {peak} KiB' for stage, peak in peaks.items()))
+    modelBytes = model_memory()
+    print('Bytes per instance: ' + ', '.join(f'{name} {size}' for name, size in modelBytes.items()))
+    data = dict(
+        timestamp=time.strftime('%Y-%m-%dT%H:%M:%S'),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        repeat=repeat,
+        results=results,
+        model_bytes=modelBytes,
+    )
+    with open(resultPath, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    print(f'{resultPath} written.')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark for the scappex conversion stages')
+    parser.add_argument('--sizes', default=SIZES, help=f'comma-separated numbers of notes (default: {SIZES})')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per board; the fastest is kept (default: 3)')
+    parser.add_argument('--output', metavar='Resultfile', default='benchmark_results.json', help='path of the JSON result file')
+    parser.add_argument('--workdir', metavar='Directory', help='directory for the generated files (default: temporary)')
+    args = parser.parse_args()
+    run([int(size) for size in args.sizes.split(',')], args.repeat, args.output, args.workdir)
@@ -0,0 +1,119 @@
+"""Startup time measurement for the scappex command line.
+
+Run silent conversions of a Scapple file in fresh interpreters, and report
+the wall-clock time and the modules that take the most time to import.
+Exit with status 1 if the wall-clock time exceeds the budget, so the
+script can be used as a check before a release.
+
+usage: import_time.py [-h] [--budget MS] [--repeat N] [--top N] [--script Scriptfile] [Sourcefile]
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/scappex
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+TOOLS_PATH = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = f'{TOOLS_PATH}/../src/scappex_.pyw'
+BOARD = f'{TOOLS_PATH}/../test/data/normal.scap'
+BUDGET = 100
+
+
+def parse_import_times(report):
+    """Return a dictionary of the import times in microseconds.
+
+    Positional arguments:
+        report -- str: output of "python -X importtime".
+
+    Key: module name, value: (self time, cumulative time, nesting level).
+    """
+    imports = {}
+    for line in report.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        selfTime, cumulative, name = line[len('import time:'):].split('|')
+        if not selfTime.strip().isdigit():
+            # Header line
+            continue
+
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        imports[name.strip()] = (int(selfTime), int(cumulative), level)
+    return imports
+
+
+def convert(command, sourcePath, workDir, env=None):
+    """Convert a fresh copy of the source in workDir and return the wall-clock time and the error output."""
+    for fileName in os.listdir(workDir):
+        os.remove(os.path.join(workDir, fileName))
+    boardPath = shutil.copy(sourcePath, workDir)
+    startTime = time.perf_counter()
+    process = subprocess.run(command + [boardPath], capture_output=True, text=True, cwd=workDir, env=env)
+    return time.perf_counter() - startTime, process.stderr
+
+
+def measure(script, sourcePath, repeat):
+    """Run silent conversions and return the fastest wall-clock time and the import times.
+
+    Positional arguments:
+        script -- str: path of the application script.
+        sourcePath -- str: path of the Scapple file.
+        repeat -- int: number of timed runs; the fastest one is reported.
+
+    The import times come from an extra run, because "-X importtime" slows down the import.
+    The runs use a private bytecode cache, so that the modules are compiled only once,
+    as with an installed application, even if PYTHONDONTWRITEBYTECODE is set.
+    """
+    command = [sys.executable, script, '--silent']
+    with tempfile.TemporaryDirectory() as workDir, tempfile.TemporaryDirectory() as cacheDir:
+        env = dict(os.environ)
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+        env['PYTHONPYCACHEPREFIX'] = cacheDir
+        convert(command, sourcePath, workDir, env)
+        # The first run compiles the modules.
+        __, report = convert([sys.executable, '-X', 'importtime', script, '--silent'], sourcePath, workDir, env)
+        best = min(convert(command, sourcePath, workDir, env)[0] for __ in range(repeat))
+    return best, parse_import_times(report)
+
+
+def run(script=SCRIPT, sourcePath=BOARD, budget=BUDGET, repeat=5, top=15):
+    """Print the startup report and return True if the conversion stays within the budget.
+
+    Optional arguments:
+        script -- str: path of the application script.
+        sourcePath -- str: path of the Scapple file.
+        budget -- float: maximum wall-clock time in milliseconds.
+        repeat -- int: number of runs; the fastest one is reported.
+        top -- int: number of modules listed.
+    """
+    seconds, imports = measure(script, sourcePath, repeat)
+    total = sum(selfTime for selfTime, __, __ in imports.values())
+    print(f'Silent conversion of "{os.path.normpath(sourcePath)}": {seconds * 1000:.1f} ms (budget: {budget} ms)')
+    print(f'Time spent importing {len(imports)} modules: {total / 1000:.1f} ms')
+    print('Slowest top level imports (cumulative ms):')
+    topLevel = [(cumulative, name) for name, (__, cumulative, level) in imports.items() if level == 0]
+    for cumulative, name in sorted(topLevel, reverse=True)[:top]:
+        print(f'{cumulative / 1000:8.1f}  {name}')
+    return seconds * 1000 <= budget
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Startup time measurement for the scappex command line')
+    parser.add_argument('sourcePath', metavar='Sourcefile', nargs='?', default=BOARD,
+                        help='path of the Scapple file to convert (default: the regression test board)')
+    parser.add_argument('--budget', type=float, default=BUDGET,
+                        help=f'maximum wall-clock time in milliseconds (default: {BUDGET})')
+    parser.add_argument('--repeat', type=int, default=5, help='runs; the fastest is reported (default: 5)')
+    parser.add_argument('--top', type=int, default=15, help='number of modules listed (default: 15)')
+    parser.add_argument('--script', metavar='Scriptfile', default=SCRIPT,
+                        help='path of the application script, e.g. a built single-file version')
+    args = parser.parse_args()
+    if not run(args.script, args.sourcePath, args.budget, args.repeat, args.top):
+        print('Startup budget exceeded.')
+        sys.exit(1)
@@ -12,7 +12,7 @@ import os
 from shutil import copyfile
 
 
-def inline_module(file, package, packagePath, text, processedModules, copyPyWriter):
+def inline_module(file, package, packagePath, text, processedModules, copyPyWriter, deferredModules=None):
     with open(file, 'r', encoding='utf-8') as f:
         print(f'Processing "{file}"...')
         if copyPyWriter:
@@ -50,6 +50,14 @@ def inline_module(file, package, packagePath, text, processedModules, copyPyWrit
                     if '__main__' in line:
                         return(text)
                 if 'import' in line:
+                    localImport = re.match('\s+from (.+?) import.+', line)
+                    if (localImport is not None) and (package in localImport.group(1)) and (deferredModules is not None):
+                        # Import within a function; the module is inlined at module level afterwards.
+                        moduleName = f'{packagePath}{localImport.group(1).replace(".", "/")}'
+                        if not (moduleName in processedModules or moduleName in deferredModules):
+                            deferredModules.append(moduleName)
+                        continue
+
                     importModule = re.match('from (.+?) import.+', line)
                     if (importModule is not None) and (package in importModule.group(1)):
                         packageName = re.sub('\.', '\/', importModule.group(1))
@@ -57,8 +65,10 @@ def inline_module(file, package, packagePath, text, processedModules, copyPyWrit
                         if not (moduleName in processedModules):
                             processedModules.append(moduleName)
                             text = inline_module(
-                                f'{moduleName}.py', package, packagePath, text, processedModules, copyPyWriter)
-                    elif line.lstrip().startswith('import'):
+                                f'{moduleName}.py', package, packagePath, text, processedModules, copyPyWriter,
+                                deferredModules)
+                    elif line.startswith('import'):
+                        # Module level import; imports within functions are kept as they are.
                         moduleName = line.replace('import ', '').rstrip()
                         if not (moduleName in processedModules):
                             processedModules.append(moduleName)
@@ -73,7 +83,24 @@ def inline_module(file, package, packagePath, text, processedModules, copyPyWrit
 def run(sourceFile, targetFile, package, packagePath, copyPyWriter=False):
     text = ''
     processedModules = []
-    text = inline_module(sourceFile, package, packagePath, text, processedModules, copyPyWriter)
+    deferredModules = []
+    text = inline_module(sourceFile, package, packagePath, text, processedModules, copyPyWriter, deferredModules)
+
+    # Modules imported within functions are inlined before the main program.
+    deferredText = ''
+    while deferredModules:
+        moduleName = deferredModules.pop(0)
+        if moduleName in processedModules:
+            continue
+
+        processedModules.append(moduleName)
+        deferredText = inline_module(
+            f'{moduleName}.py', package, packagePath, deferredText, processedModules, copyPyWriter, deferredModules)
+    mainPosition = text.find("\nif __name__ == '__main__':")
+    if mainPosition < 0:
+        text = f'{text}{deferredText}'
+    else:
+        text = f'{text[:mainPosition + 1]}{deferredText}\n{text[mainPosition + 1:]}'
     with open(targetFile, 'w', encoding='utf-8') as f:
         print(f'Writing "{targetFile}"...\n')
         f.write(text)
@@ -0,0 +1,132 @@
+"""Helper file for scappex benchmarks.
+
+Generate a synthetic Scapple board.
+
+usage: make_board.py [-h] [--notes N] [--mix MIX] [--connections C] [--locality L] [--seed S] Boardfile
+
+Copyright (c) 2022 Peter Triesberger
+For further information see https://github.com/peter88213/scappex
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import argparse
+import random
+from xml.sax.saxutils import escape
+
+KINDS = ('scene', 'notes_scene', 'major', 'minor', 'location', 'item', 'tag', 'note', 'other')
+DEFAULT_MIX = 'scene=30,notes_scene=2,major=5,minor=10,location=10,item=8,tag=10,note=10,other=15'
+# Relative share of each kind of note.
+
+APPEARANCE = dict(
+    scene=('', 'Rounded', ' Shadow="Yes"'),
+    notes_scene=('', 'Cloud', ' Shadow="Yes"'),
+    major=('1.0 0.0 0.0', 'Rounded', ''),
+    minor=('0.5 0.0 0.5', 'Rounded', ''),
+    location=('0.0 0.0 1.0', 'Rounded', ''),
+    item=('0.0 0.5 0.0', 'Rounded', ''),
+    tag=('', 'Square', ''),
+    note=('', 'Cloud', ''),
+    other=('0.3 0.3 0.3', 'Rounded', ''),
+)
+# Text color, border style, and shadow attribute of each kind of note.
+
+
+def parse_mix(mix):
+    """Return a dictionary of kind shares from a string like "scene=30,tag=10"."""
+    shares = dict.fromkeys(KINDS, 0)
+    for entry in mix.split(','):
+        kind, share = entry.split('=')
+        if kind.strip() not in shares:
+            raise ValueError(f'Unknown kind of note: "{kind}".')
+
+        shares[kind.strip()] = float(share)
+    return shares
+
+
+def encode_ids(ids):
+    """Return a sorted Scapple ID list with ranges, e.g. "1-3, 7"."""
+    groups = []
+    ids = sorted(ids)
+    i = 0
+    while i < len(ids):
+        j = i
+        while j + 1 < len(ids) and ids[j + 1] == ids[j] + 1:
+            j += 1
+        if i == j:
+            groups.append(str(ids[i]))
+        else:
+            groups.append(f'{ids[i]}-{ids[j]}')
+        i = j + 1
+    return ', '.join(groups)
+
+
+def make_board(boardPath, notes=1000, mix=DEFAULT_MIX, connections=2.0, locality=0.5, seed=1):
+    """Write a synthetic Scapple board.
+
+    Positional arguments:
+        boardPath -- str: path of the Scapple file to write.
+
+    Optional arguments:
+        notes -- int: number of notes.
+        mix -- str: relative share of each kind of note, e.g. "scene=30,tag=10".
+        connections -- float: average number of connections per note.
+        locality -- float: share of connections to notes with a near ID.
+                    These produce ranges in the ID lists, as in boards grown by hand.
+        seed -- int: random seed; the same arguments produce the same board.
+    """
+    rnd = random.Random(seed)
+    shares = parse_mix(mix)
+    kinds = rnd.choices(list(shares), weights=list(shares.values()), k=notes)
+    connected = [set() for __ in range(notes)]
+    for __ in range(int(notes * connections / 2)):
+        source = rnd.randrange(notes)
+        if rnd.random() < locality:
+            target = min(notes - 1, max(0, source + rnd.randint(-3, 3)))
+        else:
+            target = rnd.randrange(notes)
+        if source != target:
+            connected[source].add(target)
+            connected[target].add(source)
+    columns = max(1, int(notes ** 0.5))
+    xStep = min(200.0, 9000.0 / columns)
+    yStep = min(100.0, 9000.0 / (notes // columns + 1))
+    lines = [
+        "<?xml version='1.0' encoding='UTF-8' standalone='no'?>",
+        '<ScappleDocument ID="00000000-0000-0000-0000-000000000000" Version="1.1">',
+        '   <Notes>',
+    ]
+    for noteId in range(notes):
+        kind = kinds[noteId]
+        color, border, shadow = APPEARANCE[kind]
+        x = (noteId % columns) * xStep + rnd.uniform(0, xStep / 2)
+        y = (noteId // columns) * yStep + rnd.uniform(0, yStep / 2)
+        lines.append(f'      <Note Width="100" FontSize="12" ID="{noteId}" Position="{x:.1f},{y:.1f}"{shadow}>')
+        lines.append('         <Appearance>')
+        lines.append('            <Alignment>Left</Alignment>')
+        if color:
+            lines.append(f'            <TextColor>{color}</TextColor>')
+        lines.append(f'            <Border Weight="1" Style="{border}"/>')
+        lines.append('         </Appearance>')
+        lines.append(f'         <String>{escape(f"{kind} {noteId} & <text>")}</String>')
+        if connected[noteId]:
+            lines.append(f'         <ConnectedNoteIDs>{encode_ids(connected[noteId])}</ConnectedNoteIDs>')
+            if kind in ('major', 'minor'):
+                pointTo = [target for target in connected[noteId] if kinds[target] == 'scene']
+                if pointTo:
+                    lines.append(f'         <PointsToNoteIDs>{encode_ids(pointTo[:1])}</PointsToNoteIDs>')
+        lines.append('      </Note>')
+    lines.extend(['   </Notes>', '   <BackgroundShapes/>', '</ScappleDocument>', ''])
+    with open(boardPath, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Synthetic Scapple board generator')
+    parser.add_argument('boardPath', metavar='Boardfile', help='path of the Scapple file to write')
+    parser.add_argument('--notes', type=int, default=1000, help='number of notes (default: 1000)')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'relative share of each kind of note (default: {DEFAULT_MIX})')
+    parser.add_argument('--connections', type=float, default=2.0, help='average number of connections per note (default: 2)')
+    parser.add_argument('--locality', type=float, default=0.5, help='share of connections to notes with a near ID (default: 0.5)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+    args = parser.parse_args()
+    make_board(args.boardPath, args.notes, args.mix, args.connections, args.locality, args.seed)
+    print(f'{args.boardPath} written.')